@@ -1,5 +1,11 @@
 """Provide common functionality shared among all the solutions."""
 
+import array
+import collections
+import itertools
+import mmap
+import operator
+import re
 from typing import (
     Sequence,
     cast,
@@ -9,10 +15,12 @@ from typing import (
     TypeVar,
     Iterable,
     Tuple,
-    Optional,
+    List,
+    Final,
+    Deque,
 )
 
-from icontract import DBC, require
+from icontract import DBC, require, ensure, SLOW
 
 
 class Lines(DBC):
@@ -53,6 +61,32 @@ class Lines(DBC):
         """
         return cast(Lines, lines)
 
+    # fmt: off
+    @staticmethod
+    @ensure(
+        lambda result:
+        all('\n' not in line and '\r' not in line for line in result),
+        enabled=SLOW
+    )
+    # fmt: on
+    def from_text(text: str) -> "Lines":
+        r"""
+        Split the ``text`` into lines.
+
+        :py:meth:`str.splitlines` splits on all the line boundaries, so the lines
+        satisfy the properties by construction and need not be checked one by one.
+
+        >>> list(Lines.from_text("a\nb\r\nc\n"))
+        ['a', 'b', 'c']
+        """
+        return cast(Lines, text.splitlines())
+
+    @staticmethod
+    def from_file(path: str) -> "Lines":
+        """Read the file at ``path`` and split it into lines."""
+        with open(path, "rt", encoding="utf-8") as fid:
+            return Lines.from_text(fid.read())
+
     def __add__(self, other: "Lines") -> "Lines":
         """Concatenate two list of lines."""
         raise NotImplementedError("Only for type annotations")
@@ -82,10 +116,171 @@ class Lines(DBC):
         raise NotImplementedError("Only for type annotations")
 
 
+#: Line boundaries of :py:meth:`str.splitlines` encoded in UTF-8
+NEWLINE_RE = re.compile(b"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+
+class MappedLines(DBC):
+    r"""
+    Represent the lines of a memory-mapped file decoded only on access.
+
+    The lines are split on the same boundaries as :py:meth:`str.splitlines`.
+    Only the offsets of the line starts are kept in memory, while the lines are
+    decoded as UTF-8 on demand.
+    The instance can be used in place of :py:class:`Lines` for reading.
+
+    Use :py:meth:`view` and :py:meth:`block` to access the raw bytes without
+    copying them. The views need to be released before the lines are closed.
+    """
+
+    #: Start of each line in the file, followed by the end of the last line plus 1
+    offsets: Final[Sequence[int]]
+
+    def __init__(self, path: str) -> None:
+        """Memory-map the file at ``path`` and index the starts of its lines."""
+        with open(path, "rb") as fid:
+            try:
+                self._data = mmap.mmap(
+                    fid.fileno(), 0, access=mmap.ACCESS_READ
+                )  # type: Union[mmap.mmap, bytes]
+            except ValueError:
+                # Empty files can not be memory-mapped.
+                self._data = b""
+
+        offsets = array.array("q", [0])
+        offsets.extend(match.end() for match in NEWLINE_RE.finditer(self._data))
+
+        if len(self._data) > 0 and offsets[-1] != len(self._data):
+            offsets.append(len(self._data) + 1)
+
+        self.offsets = offsets
+        self._buffer = memoryview(self._data)
+
+    def close(self) -> None:
+        """
+        Release the underlying memory map.
+
+        All the views obtained by :py:meth:`view` and :py:meth:`block` need to be
+        released beforehand, otherwise :py:class:`BufferError` is raised.
+        """
+        self._buffer.release()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self) -> "MappedLines":
+        """Return the instance itself as the context."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Release the memory map at the end of the context."""
+        self.close()
+
+    @require(lambda self, index: 0 <= index < len(self))
+    @ensure(lambda self, index, result: result[0] <= result[1])
+    def span(self, index: int) -> Tuple[int, int]:
+        """Return the start and the end of the line at ``index`` in the file."""
+        start = self.offsets[index]
+        end = self.offsets[index + 1]
+
+        if end > len(self._data):
+            return start, len(self._data)
+
+        # The separator is the longest line boundary preceding the next line,
+        # as the line itself can not contain any line boundary.
+        tail = self._data[max(start, end - 3) : end]
+        if tail.endswith((b"\xe2\x80\xa8", b"\xe2\x80\xa9")):
+            return start, end - 3
+        elif tail.endswith((b"\r\n", b"\xc2\x85")):
+            return start, end - 2
+
+        return start, end - 1
+
+    @require(lambda self, index: 0 <= index < len(self))
+    @ensure(lambda self, index, result: result.readonly)
+    def view(self, index: int) -> memoryview:
+        """Return the bytes of the line at ``index`` without copying them."""
+        start, end = self.span(index)
+        return self._buffer[start:end]
+
+    # fmt: off
+    @require(lambda self, start, end: 0 <= start <= end <= len(self))
+    @ensure(
+        lambda self, start, end, result:
+        list(Lines.from_text(bytes(result).decode("utf-8")))
+        == [self[index] for index in range(start, end)],
+        enabled=SLOW
+    )
+    # fmt: on
+    def block(self, start: int, end: int) -> memoryview:
+        """
+        Return the bytes of the lines ``[start, end)`` without copying them.
+
+        The block includes the line separators, so that it can be passed as
+        a whole to a parser working on the text.
+        """
+        return self._buffer[
+            self.offsets[start] : min(self.offsets[end], len(self._buffer))
+        ]
+
+    # pylint: disable=function-redefined
+
+    @overload
+    def __getitem__(self, index: int) -> str:
+        """Get the line at the given integer index."""
+        raise NotImplementedError("Only for type annotations")
+
+    @overload
+    def __getitem__(self, index: slice) -> Lines:
+        """Get the slice of the lines."""
+        raise NotImplementedError("Only for type annotations")
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, Lines]:
+        """Decode the line(s) at the given index."""
+        if isinstance(index, slice):
+            return Lines([self[i] for i in range(*index.indices(len(self)))])
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        start, end = self.span(index)
+        return self._data[start:end].decode("utf-8")
+
+    def __len__(self) -> int:
+        """Return the number of the lines."""
+        return len(self.offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate lazily over the decoded lines."""
+        for index in range(len(self)):
+            yield self[index]
+
+
 T = TypeVar("T")  # pylint: disable=invalid-name
 
 
-def pairwise(iterable: Iterable[T]) -> Iterable[Tuple[T, T]]:
+def split_on_blank_lines(lines: Iterable[str]) -> Iterator[List[str]]:
+    """
+    Iterate lazily over the groups of ``lines`` separated by blank lines.
+
+    >>> list(split_on_blank_lines(["a", "b", "", "", "c", " "]))
+    [['a', 'b'], ['c']]
+    """
+    group = []  # type: List[str]
+    for line in lines:
+        if line.strip():
+            group.append(line)
+        elif group:
+            yield group
+            group = []
+
+    if group:
+        yield group
+
+
+def pairwise(iterable: Iterable[T]) -> Iterator[Tuple[T, T]]:
     """
     Iterate over ``(s0, s1, s2, ...)`` as ``((s0, s1), (s1, s2), ...)``.
 
@@ -100,10 +295,74 @@ def pairwise(iterable: Iterable[T]) -> Iterable[Tuple[T, T]]:
 
     >>> list(pairwise([1, 2, 3]))
     [(1, 2), (2, 3)]
+
+    >>> list(pairwise([None, 1, None]))
+    [(None, 1), (1, None)]
+    """
+    first, second = itertools.tee(iterable)
+    next(second, None)
+    return zip(first, second)
+
+
+@require(lambda size: size >= 1)
+def sliding_window(iterable: Iterable[T], size: int) -> Iterator[Tuple[T, ...]]:
     """
-    previous = None  # type: Optional[T]
-    for current in iterable:
-        if previous is not None:
-            yield previous, current
+    Iterate over all the windows of ``size`` consecutive items in ``iterable``.
 
-        previous = current
+    >>> list(sliding_window([1, 2, 3, 4], 3))
+    [(1, 2, 3), (2, 3, 4)]
+
+    >>> list(sliding_window([1, 2], 3))
+    []
+
+    >>> list(sliding_window([None, None], 1))
+    [(None,), (None,)]
+    """
+    iterator = iter(iterable)
+    window = collections.deque(
+        itertools.islice(iterator, size - 1), maxlen=size
+    )  # type: Deque[T]
+
+    for item in iterator:
+        window.append(item)
+        yield tuple(window)
+
+
+@require(lambda size: size >= 1)
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Split ``iterable`` into consecutive chunks of ``size`` items.
+
+    The last chunk is shorter if the items do not divide evenly.
+
+    >>> list(chunked([1, 2, 3, 4, 5], 2))
+    [[1, 2], [3, 4], [5]]
+
+    >>> list(chunked([], 2))
+    []
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def differences(values: Iterable[int]) -> Iterator[int]:
+    """
+    Iterate over the differences between the consecutive ``values``.
+
+    This is the counterpart of :py:func:`pairwise` for numbers, where
+    the subtraction is mapped over the values without creating tuples.
+
+    >>> list(differences([1, 4, 6, 6]))
+    [3, 2, 0]
+
+    >>> list(differences([1]))
+    []
+    """
+    first, second = itertools.tee(values)
+    next(second, None)
+    return map(operator.sub, second, first)
@@ -1,4 +1,5 @@
 import collections
+import itertools
 import re
 from typing import (
     MutableMapping,
@@ -6,6 +7,10 @@ from typing import (
     cast,
     List,
     Iterator,
+    Sequence,
+    Optional,
+    Deque,
+    Tuple,
 )
 
 from icontract import require, ensure, DBC
@@ -36,6 +41,36 @@ class HistogramOfDeltas(DBC):
         raise NotImplementedError("Only for type annotations")
 
 
+#: Use counting sort if the maximum adapter is at most this factor times
+#: the number of adapters
+COUNTING_SORT_FACTOR = 8
+
+
+@require(lambda adapters: len(set(adapters)) == len(adapters))
+@require(lambda adapters: all(adapter >= 0 for adapter in adapters))
+@ensure(lambda adapters, result: result == sorted(adapters))
+def sort_adapters(adapters: Sequence[int]) -> List[int]:
+    """
+    Sort the ``adapters`` in ascending order of jolts.
+
+    If the jolts are bounded by a small multiple of the number of adapters,
+    as is the case for a valid adapter chain, we mark the present jolts in
+    a byte map and read them off in ``O(max(adapters))`` instead of sorting.
+    """
+    if len(adapters) == 0:
+        return []
+
+    max_jolt = max(adapters)
+    if max_jolt > COUNTING_SORT_FACTOR * len(adapters):
+        return sorted(adapters)
+
+    present = bytearray(max_jolt + 1)
+    for adapter in adapters:
+        present[adapter] = 1
+
+    return [jolt for jolt, is_present in enumerate(present) if is_present]
+
+
 # fmt: off
 @require(lambda adapters: len(set(adapters)) == len(adapters))
 @require(lambda adapters: all(adapter >= 0 for adapter in adapters))
@@ -54,17 +89,69 @@ class HistogramOfDeltas(DBC):
     "Empty histogram on empty input"
 )
 # fmt: on
-def histogram_differences(adapters: List[int]) -> HistogramOfDeltas:
+def histogram_differences(adapters: Sequence[int]) -> HistogramOfDeltas:
     """Compute the histogram of jolt differences in ``adapters``."""
-    histo = collections.defaultdict(lambda: 0)  # type: MutableMapping[int, int]
+    chain = sort_adapters(adapters)
 
-    for prev, current in common.pairwise(sorted([0] + adapters + [max(adapters) + 3])):
-        delta = current - prev
-        histo[delta] += 1
+    # Consider the charging output as 0 and the device input as max + 3
+    histo = collections.Counter(
+        common.differences(itertools.chain([0], chain, [chain[-1] + 3]))
+    )  # type: MutableMapping[int, int]
 
     return HistogramOfDeltas(histo)
 
 
+# fmt: off
+@require(lambda adapters: len(set(adapters)) == len(adapters))
+@require(lambda adapters: all(adapter > 0 for adapter in adapters))
+@require(lambda modulus: modulus is None or modulus >= 1)
+@ensure(lambda result: result >= 0)
+@ensure(
+    lambda modulus, result:
+    modulus is None or result < modulus
+)
+@ensure(
+    lambda adapters, modulus, result:
+    not (len(adapters) == 0 and modulus is None) or result == 1,
+    "The device can be directly connected to the charging outlet"
+)
+# fmt: on
+def count_arrangements(adapters: Sequence[int], modulus: Optional[int] = None) -> int:
+    """
+    Count the arrangements of ``adapters`` connecting the outlet to the device.
+
+    We sort the adapters only once and count the ways to reach each adapter
+    from the charging outlet as the sum of the ways to reach the adapters
+    at most 3 jolts lower. Only these are kept in a sliding window.
+
+    If the ``modulus`` is given, the count is reported modulo ``modulus``
+    so that the intermediate counts never grow into big integers.
+
+    :return: Number of arrangements (modulo ``modulus``, if given)
+    """
+    # The window holds (jolt, number of ways to reach it).
+    window = collections.deque([(0, 1)])  # type: Deque[Tuple[int, int]]
+
+    for jolt in sort_adapters(adapters):
+        while len(window) > 0 and jolt - window[0][0] > 3:
+            window.popleft()
+
+        ways = sum(window_ways for _, window_ways in window)
+        if modulus is not None:
+            ways %= modulus
+
+        window.append((jolt, ways))
+
+    # The device is 3 jolts above the highest adapter so it can only
+    # be reached from it.
+    result = window[-1][1]
+
+    if modulus is not None:
+        result %= modulus
+
+    return result
+
+
 @ensure(lambda result: result >= 0)
 def compute_result(histo: HistogramOfDeltas) -> int:
     """Analyze the histogram of jolt differences.
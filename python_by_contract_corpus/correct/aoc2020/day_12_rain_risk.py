@@ -2,11 +2,13 @@
 Input: list of actions
 Output: position, Manhattan distance
 """
+import array
 import dataclasses
 import re
 from enum import Enum
+from typing import Final, Sequence, Tuple
 
-from icontract import require, ensure
+from icontract import require, ensure, DBC, SLOW
 
 from python_by_contract_corpus.common import Lines
 
@@ -50,7 +52,7 @@ class ShipPosition:
 # fmt: on
 def parse_input(puzzle_input: str) -> Lines:
     """Split the puzzle input along the newlines."""
-    return Lines(puzzle_input.splitlines())
+    return Lines.from_text(puzzle_input)
 
 
 # fmt: off
@@ -64,7 +66,7 @@ def parse_input(puzzle_input: str) -> Lines:
 def update_position(current_position: ShipPosition, move: str) -> ShipPosition:
     """Execute a single ``move`` on ``current_position`` and return a new position."""
     action, value = move[0], int(move[1:])
-    next_position = current_position
+    next_position = dataclasses.replace(current_position)
     if action == "N":
         next_position.vertical += value
     elif action == "S":
@@ -75,11 +77,11 @@ def update_position(current_position: ShipPosition, move: str) -> ShipPosition:
         next_position.horizontal -= value
     elif action == "L":
         next_position.orientation = Orientation(
-            ((next_position.orientation).value - (value / 90)) % 4
+            ((next_position.orientation).value - value // 90) % 4
         )
     elif action == "R":
         next_position.orientation = Orientation(
-            ((next_position.orientation).value + (value / 90)) % 4
+            ((next_position.orientation).value + value // 90) % 4
         )
     elif action == "F":
         if next_position.orientation == Orientation.NORTH:
@@ -94,16 +96,198 @@ def update_position(current_position: ShipPosition, move: str) -> ShipPosition:
     return next_position
 
 
-@require(
-    lambda puzzle_input: re.match(
-        r"^(([NSEWF][0-9]+)|([LR](0|90|180|270|360)))"
-        r"(\n(([NSEWF][0-9]+)|([LR](0|90|180|270|360))))*\Z",
-        puzzle_input,
-    )
+COMMAND_RE = re.compile(r"([NSEWLRF])([0-9]+)")
+
+#: Pattern of the whole puzzle input with the rotations in multiples of 90°
+PUZZLE_INPUT_RE = re.compile(
+    r"^(([NSEWF][0-9]+)|([LR](0|90|180|270|360)))"
+    r"(\n(([NSEWF][0-9]+)|([LR](0|90|180|270|360))))*\Z"
 )
+
+
+@require(lambda puzzle_input: PUZZLE_INPUT_RE.match(puzzle_input))
 def solve(puzzle_input: str) -> ShipPosition:
     """Execute the instructions and return the final ship's position."""
     current_position = ShipPosition(0, 0, Orientation.EAST)
     for command in parse_input(puzzle_input):
         current_position = update_position(current_position, command)
     return current_position
+
+
+class Commands(DBC):
+    """Represent the navigation commands as parallel arrays of actions and values."""
+
+    actions: Final[bytes]  #: ASCII code of the action of each command
+    values: Final[Sequence[int]]  #: Value of each command
+
+    @require(lambda actions, values: len(actions) == len(values))
+    @require(lambda actions: all(chr(action) in "NSEWLRF" for action in actions))
+    def __init__(self, actions: bytes, values: Sequence[int]) -> None:
+        """Initialize with the given values."""
+        self.actions = actions
+        self.values = values
+
+    def __len__(self) -> int:
+        """Return the number of the commands."""
+        return len(self.actions)
+
+
+# fmt: off
+@require(lambda puzzle_input: PUZZLE_INPUT_RE.match(puzzle_input))
+@require(
+    lambda puzzle_input:
+    all(
+        int(value) < 1 << 63
+        for value in re.findall(r"[0-9]+", puzzle_input)
+    )
+)
+@ensure(lambda puzzle_input, result: len(result) == len(puzzle_input.splitlines()))
+# fmt: on
+def parse_commands(puzzle_input: str) -> Commands:
+    """Parse all the commands of the ``puzzle_input`` at once."""
+    pairs = COMMAND_RE.findall(puzzle_input)
+
+    return Commands(
+        actions="".join(action for action, _ in pairs).encode("ascii"),
+        values=array.array("q", (int(value) for _, value in pairs)),
+    )
+
+
+#: ASCII code of the action moving north in :py:attr:`Commands.actions`
+ACTION_NORTH = ord("N")
+
+#: ASCII code of the action moving south in :py:attr:`Commands.actions`
+ACTION_SOUTH = ord("S")
+
+#: ASCII code of the action moving east in :py:attr:`Commands.actions`
+ACTION_EAST = ord("E")
+
+#: ASCII code of the action moving west in :py:attr:`Commands.actions`
+ACTION_WEST = ord("W")
+
+#: ASCII code of the action turning left in :py:attr:`Commands.actions`
+ACTION_LEFT = ord("L")
+
+#: ASCII code of the action turning right in :py:attr:`Commands.actions`
+ACTION_RIGHT = ord("R")
+
+#: ASCII code of the action moving forward in :py:attr:`Commands.actions`
+ACTION_FORWARD = ord("F")
+
+
+def _rotate(x: int, y: int, action: int, degrees: int) -> Tuple[int, int]:
+    """Rotate the vector ``(x, y)`` by the ``degrees`` in multiples of 90°."""
+    quarter_turns = degrees // 90 if action == ACTION_LEFT else -(degrees // 90)
+    quarter_turns %= 4
+
+    if quarter_turns == 1:
+        return -y, x
+    elif quarter_turns == 2:
+        return -x, -y
+    elif quarter_turns == 3:
+        return y, -x
+
+    return x, y
+
+
+# fmt: off
+@require(
+    lambda commands:
+    all(
+        value in (0, 90, 180, 270, 360)
+        for action, value in zip(commands.actions, commands.values)
+        if action in (ACTION_LEFT, ACTION_RIGHT)
+    )
+)
+@ensure(
+    lambda commands, result:
+    len(commands) == 0
+    or result == (
+        lambda position: (position.horizontal, position.vertical)
+    )(
+        solve(
+            "\n".join(
+                f"{chr(action)}{value}"
+                for action, value in zip(commands.actions, commands.values)
+            )
+        )
+    ),
+    enabled=SLOW
+)
+# fmt: on
+def navigate_ship(commands: Commands) -> Tuple[int, int]:
+    """
+    Move the ship itself by the ``commands``.
+
+    The heading is kept as a unit vector which is rotated with integers only.
+
+    :return: final east and north coordinates of the ship
+    """
+    east = 0
+    north = 0
+    heading_east = 1
+    heading_north = 0
+
+    for action, value in zip(commands.actions, commands.values):
+        if action == ACTION_FORWARD:
+            east += heading_east * value
+            north += heading_north * value
+        elif action == ACTION_NORTH:
+            north += value
+        elif action == ACTION_SOUTH:
+            north -= value
+        elif action == ACTION_EAST:
+            east += value
+        elif action == ACTION_WEST:
+            east -= value
+        else:
+            heading_east, heading_north = _rotate(
+                heading_east, heading_north, action, value
+            )
+
+    return east, north
+
+
+# fmt: off
+@require(
+    lambda commands:
+    all(
+        value in (0, 90, 180, 270, 360)
+        for action, value in zip(commands.actions, commands.values)
+        if action in (ACTION_LEFT, ACTION_RIGHT)
+    )
+)
+# fmt: on
+def navigate_waypoint(
+    commands: Commands, waypoint: Tuple[int, int] = (10, 1)
+) -> Tuple[int, int]:
+    """
+    Move the ship towards the ``waypoint`` which is moved by the ``commands``.
+
+    The waypoint is relative to the ship and is rotated around it with integers
+    only.
+
+    :return: final east and north coordinates of the ship
+    """
+    east = 0
+    north = 0
+    waypoint_east, waypoint_north = waypoint
+
+    for action, value in zip(commands.actions, commands.values):
+        if action == ACTION_FORWARD:
+            east += waypoint_east * value
+            north += waypoint_north * value
+        elif action == ACTION_NORTH:
+            waypoint_north += value
+        elif action == ACTION_SOUTH:
+            waypoint_north -= value
+        elif action == ACTION_EAST:
+            waypoint_east += value
+        elif action == ACTION_WEST:
+            waypoint_east -= value
+        else:
+            waypoint_east, waypoint_north = _rotate(
+                waypoint_east, waypoint_north, action, value
+            )
+
+    return east, north
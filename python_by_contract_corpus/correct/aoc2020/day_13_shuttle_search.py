@@ -1,6 +1,7 @@
+import math
 import re
 import sys
-from typing import List, Set, Tuple
+from typing import List, Set, Tuple, Optional
 
 from icontract import require, ensure
 
@@ -53,12 +54,101 @@ def parse_input(lines: Lines) -> Tuple[int, Set[int]]:
     return (int(min_time_text), bus_ids)
 
 
+# fmt: off
+@require(lambda text: re.match(r"^([1-9][0-9]*|x)(,([1-9][0-9]*|x))*\Z", text))
+@ensure(
+    lambda text, result:
+    [bus_id for bus_id, _ in result] == [
+        int(part) for part in text.split(",") if part != "x"
+    ]
+)
+@ensure(
+    lambda text, result:
+    all(int(text.split(",")[offset]) == bus_id for bus_id, offset in result)
+)
+# fmt: on
+def parse_bus_offsets(text: str) -> List[Tuple[int, int]]:
+    """
+    Parse the bus IDs from ``text`` together with their offsets in the timetable.
+
+    :return: List of (bus ID, offset), skipping the ``x`` entries
+    """
+    return [
+        (int(part), offset)
+        for offset, part in enumerate(text.split(","))
+        if part != "x"
+    ]
+
+
+# fmt: off
+@require(lambda lines: len(lines) == 2)
+@require(
+    lambda lines:
+    len(lines) == 2
+    and re.match(r"^\d+\Z", lines[0])
+    and re.match(r"^([1-9][0-9]*|x)(,([1-9][0-9]*|x))*\Z", lines[1])
+)
+# fmt: on
+def parse_input_with_offsets(lines: Lines) -> Tuple[int, List[Tuple[int, int]]]:
+    """Parse the input into (earliest departure time, (bus ID, offset) pairs)."""
+    min_time_text, bus_ids_text = lines
+    return int(min_time_text), parse_bus_offsets(bus_ids_text)
+
+
+# fmt: off
+@require(lambda buses: all(bus_id > 0 for bus_id, _ in buses))
+@require(lambda buses: all(offset >= 0 for _, offset in buses))
+@ensure(lambda result: result is None or result >= 0)
+@ensure(
+    lambda buses, result:
+    result is None
+    or all((result + offset) % bus_id == 0 for bus_id, offset in buses),
+    "All buses depart at their offsets"
+)
+# fmt: on
+def find_aligned_departure(buses: List[Tuple[int, int]]) -> Optional[int]:
+    """
+    Find the earliest time when each of the ``buses`` departs at its offset.
+
+    Each bus imposes a congruence ``t ≡ -offset (mod bus_id)``. We merge
+    the congruences one by one (the Chinese remainder theorem), dividing out
+    the greatest common divisor so that the bus IDs need not be coprime.
+
+    :return: The earliest such time, or None if the buses never align
+    """
+    remainder = 0
+    modulus = 1
+
+    for bus_id, offset in buses:
+        target = -offset % bus_id
+
+        divisor = math.gcd(modulus, bus_id)
+        if (target - remainder) % divisor != 0:
+            return None
+
+        # Solve remainder + modulus * k ≡ target (mod bus_id) for k.
+        reduced_bus_id = bus_id // divisor
+        k = (
+            (target - remainder)
+            // divisor
+            * pow(modulus // divisor, -1, reduced_bus_id)
+            % reduced_bus_id
+        )
+
+        remainder += modulus * k
+        modulus *= reduced_bus_id
+        remainder %= modulus
+
+    return remainder
+
+
 def main() -> None:
     """Execute the main routine."""
-    min_time, bus_ids = parse_input(Lines(sys.stdin.readlines()))
-    departure_time, bus_id = find_departure(min_time, bus_ids)
+    min_time, buses = parse_input_with_offsets(Lines.from_text(sys.stdin.read()))
+    departure_time, bus_id = find_departure(min_time, {bus_id for bus_id, _ in buses})
     wait_time = departure_time - min_time
     print(wait_time * bus_id)
+    print(find_aligned_departure(buses))
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 import re
 from typing import List, Mapping, MutableMapping, Tuple, Final
 
-from icontract import require, ensure, DBC
+from icontract import require, ensure, DBC, SLOW
 
 # crosshair: on
 from python_by_contract_corpus.common import Lines
@@ -150,3 +150,184 @@ def execute(program: Program) -> Memory:
 def sum_memory(memory: Memory) -> int:
     """Sum the values in the memory slots."""
     return sum(memory.slots.values())
+
+
+# fmt: off
+@require(lambda lines: len(lines) >= 1)
+@require(lambda lines: MASK_RE.match(lines[0]))
+@require(
+    lambda lines:
+    all(MASK_RE.match(line) or WRITE_RE.match(line) for line in lines)
+)
+@ensure(
+    lambda lines, result:
+    len(result) == sum(1 for line in lines if MASK_RE.match(line))
+)
+@ensure(
+    lambda lines, result:
+    sum(len(program.writes) for program in result)
+    == sum(1 for line in lines if WRITE_RE.match(line))
+)
+# fmt: on
+def parse_programs(lines: Lines) -> List[Program]:
+    """
+    Parse the input with interleaved masks into a sequence of programs.
+
+    Each mask starts a new program which holds the subsequent writes.
+    """
+    result = []  # type: List[Program]
+
+    for line in lines:
+        if MASK_RE.match(line):
+            result.append(Program(mask=parse_mask(text=line), writes=[]))
+        else:
+            address, value = parse_write(text=line)
+            if value >= 2**36:
+                raise ValueError(
+                    f"Value does not fit in 35 bits (>= {2**36=}): {value}"
+                )
+
+            result[-1].writes.append(Write(address=address, value=value))
+
+    return result
+
+
+def execute_programs(programs: List[Program]) -> Memory:
+    """Execute the ``programs`` one after another and return the memory values."""
+    slots = dict()  # type: MutableMapping[int, int]
+    for program in programs:
+        slots.update(execute(program=program).slots)
+
+    return Memory(slots=slots)
+
+
+@ensure(lambda mask, result: result & ~mask.clearing == 0)
+@ensure(lambda mask, result: result & mask.setting == 0)
+def floating_bits(mask: Mask) -> int:
+    """Retrieve the floating bits (``X``) of the ``mask`` as a bit mask."""
+    return mask.clearing & ~mask.setting
+
+
+class FloatingWrite(DBC):
+    """
+    Represent a write of a value to all the addresses matching a ternary pattern.
+
+    The address bits set in :py:attr:`floating` take both values, while all
+    the other bits are given by :py:attr:`fixed`.
+    """
+
+    fixed: Final[int]  #: Bits of the addresses which do not float
+    floating: Final[int]  #: Mask of the floating bits
+    value: Final[int]  #: Value to be written
+
+    @require(lambda fixed: fixed >= 0)
+    @require(lambda floating: floating >= 0)
+    @require(lambda fixed, floating: fixed & floating == 0)
+    @require(lambda value: 0 <= value <= 2**36 - 1, "The value in expected range")
+    def __init__(self, fixed: int, floating: int, value: int) -> None:
+        """Initialize with the given values."""
+        self.fixed = fixed
+        self.floating = floating
+        self.value = value
+
+
+def overlap(write: FloatingWrite, another: FloatingWrite) -> bool:
+    """Check whether the ``write`` and ``another`` share at least one address."""
+    return (write.fixed ^ another.fixed) & ~write.floating & ~another.floating == 0
+
+
+@ensure(lambda write, result: all(piece.value == write.value for piece in result))
+@ensure(lambda another, result: all(not overlap(piece, another) for piece in result))
+# fmt: off
+@ensure(
+    lambda write, another, result:
+    sum(2 ** bin(piece.floating).count("1") for piece in result)
+    <= 2 ** bin(write.floating).count("1")
+)
+# fmt: on
+def subtract(write: FloatingWrite, another: FloatingWrite) -> List[FloatingWrite]:
+    """
+    Remove the addresses of ``another`` from the ``write``.
+
+    The remaining addresses are split into disjoint patterns. Every bit which
+    floats in ``write``, but is fixed in ``another``, splits off a pattern where
+    the bit disagrees with ``another``, and is then fixed to agree with it.
+    Hence we produce at most as many patterns as there are such bits.
+    """
+    if not overlap(write, another):
+        return [write]
+
+    result = []  # type: List[FloatingWrite]
+
+    fixed = write.fixed
+    floating = write.floating
+
+    splitting = write.floating & ~another.floating
+    while splitting != 0:
+        bit = splitting & -splitting
+        splitting ^= bit
+
+        floating ^= bit
+        result.append(
+            FloatingWrite(
+                fixed=fixed | (~another.fixed & bit),
+                floating=floating,
+                value=write.value,
+            )
+        )
+        fixed |= another.fixed & bit
+
+    return result
+
+
+# fmt: off
+@ensure(
+    lambda result:
+    all(
+        not overlap(write, another)
+        for i, write in enumerate(result)
+        for another in result[i + 1:]
+    ),
+    "Writes are disjoint",
+    enabled=SLOW
+)
+# fmt: on
+def execute_v2(programs: List[Program]) -> List[FloatingWrite]:
+    """
+    Execute the ``programs`` with the memory address decoder (version 2).
+
+    The mask applies to the addresses instead of the values: the bits ``1``
+    are set, the bits ``0`` are left unchanged and the bits ``X`` float,
+    *i.e.*, the value is written to all their combinations.
+
+    Instead of materializing all the floating addresses, we keep the writes as
+    disjoint ternary patterns and subtract each new write from the previous ones.
+
+    :return: Disjoint floating writes which describe the final memory
+    """
+    writes = []  # type: List[FloatingWrite]
+
+    for program in programs:
+        floating = floating_bits(program.mask)
+
+        for write in program.writes:
+            new_write = FloatingWrite(
+                fixed=(write.address | program.mask.setting) & ~floating,
+                floating=floating,
+                value=write.value,
+            )
+
+            remaining = []  # type: List[FloatingWrite]
+            for previous in writes:
+                remaining.extend(subtract(previous, new_write))
+
+            remaining.append(new_write)
+            writes = remaining
+
+    return writes
+
+
+@ensure(lambda result: result >= 0)
+def sum_memory_v2(writes: List[FloatingWrite]) -> int:
+    """Sum the values in the memory given as disjoint floating ``writes``."""
+    return sum(write.value * 2 ** bin(write.floating).count("1") for write in writes)
@@ -1,7 +1,10 @@
+import array
+import bisect
+import collections
 import re
-from typing import List, Tuple, Final
+from typing import List, Tuple, Final, MutableMapping, Optional, Sequence, Set
 
-from icontract import require, ensure, DBC
+from icontract import require, ensure, DBC, SLOW
 
 # crosshair: on
 from python_by_contract_corpus.common import Lines
@@ -38,6 +41,95 @@ def applies(rule: Rule, value: int) -> bool:
     return any(range[0] <= value <= range[1] for range in rule.ranges)
 
 
+class RuleIndex(DBC):
+    """
+    Index the rules over the domain of values.
+
+    The domain is split into disjoint segments at :py:attr:`boundaries`. The segment
+    ``i`` spans the values ``boundaries[i] <= value < boundaries[i + 1]``, and all
+    the values in it are matched by exactly the rules given by the bitset
+    ``masks[i]``. The values below the first boundary are matched by no rule.
+    """
+
+    boundaries: Final[List[int]]  #: Starts of the segments in ascending order
+    masks: Final[List[int]]  #: Bitset of the matching rules for each segment
+
+    @require(
+        lambda boundaries: all(
+            previous < current for previous, current in zip(boundaries, boundaries[1:])
+        )
+    )
+    @require(lambda boundaries, masks: len(boundaries) == len(masks))
+    @require(lambda masks: all(mask >= 0 for mask in masks))
+    @require(lambda masks: len(masks) == 0 or masks[-1] == 0)
+    def __init__(self, boundaries: List[int], masks: List[int]) -> None:
+        """Initialize with the given values."""
+        self.boundaries = boundaries
+        self.masks = masks
+
+
+@ensure(lambda result: result >= 0)
+def matching_rules(index: RuleIndex, value: int) -> int:
+    """Look up the bitset of the rules in the ``index`` which apply to ``value``."""
+    i = bisect.bisect_right(index.boundaries, value) - 1
+    if i < 0:
+        return 0
+
+    return index.masks[i]
+
+
+# fmt: off
+@ensure(
+    lambda rules, result:
+    all(
+        ((matching_rules(index=result, value=value) >> i) & 1 == 1)
+        == applies(rule=rule, value=value)
+        for boundary in result.boundaries
+        for value in (boundary - 1, boundary)
+        for i, rule in enumerate(rules)
+    ),
+    "Index consistent with the rules at the edges of all the segments"
+)
+# fmt: on
+def index_rules(rules: List[Rule]) -> RuleIndex:
+    """
+    Merge the ranges of all the ``rules`` into a single sorted index.
+
+    The bit ``i`` of a bitset in the index corresponds to ``rules[i]``.
+    """
+    # Map value 🠒 changes in the number of active ranges per rule at that value
+    events = collections.defaultdict(
+        list
+    )  # type: MutableMapping[int, List[Tuple[int, int]]]
+
+    for i, rule in enumerate(rules):
+        for first, last in rule.ranges:
+            events[first].append((i, 1))
+            events[last + 1].append((i, -1))
+
+    boundaries = []  # type: List[int]
+    masks = []  # type: List[int]
+
+    active = [0] * len(rules)
+    mask = 0
+    for value in sorted(events.keys()):
+        for i, change in events[value]:
+            active[i] += change
+            if active[i] > 0:
+                mask |= 1 << i
+            else:
+                mask &= ~(1 << i)
+
+        if len(masks) > 0 and masks[-1] == mask:
+            # Merge the adjacent segments with the same rules
+            continue
+
+        boundaries.append(value)
+        masks.append(mask)
+
+    return RuleIndex(boundaries=boundaries, masks=masks)
+
+
 RULE_RE = re.compile(
     r"^([^:]+): "
     r"(0|[1-9][0-9]*)-(0|[1-9][0-9]*)"
@@ -89,6 +181,16 @@ def parse_nearby_tickets(lines: List[str]) -> List[List[int]]:
 
 
 # fmt: off
+@require(
+    lambda rules, index:
+    index is None
+    or (
+        lambda expected:
+        index.boundaries == expected.boundaries and index.masks == expected.masks
+    )(index_rules(rules=rules)),
+    "The index has been built from the rules",
+    enabled=SLOW
+)
 @ensure(
     lambda ticket, result:
     all(
@@ -97,11 +199,21 @@ def parse_nearby_tickets(lines: List[str]) -> List[List[int]]:
     )
 )
 # fmt: on
-def invalid_fields(rules: List[Rule], ticket: List[int]) -> List[int]:
-    """Select the invalid fields from a ``ticket`` according to ``rules``."""
+def invalid_fields(
+    rules: List[Rule], ticket: List[int], index: Optional[RuleIndex] = None
+) -> List[int]:
+    """
+    Select the invalid fields from a ``ticket`` according to ``rules``.
+
+    Pass in the ``index`` of the ``rules`` to reuse it over many tickets.
+    Otherwise, the index is built on every call.
+    """
+    if index is None:
+        index = index_rules(rules=rules)
+
     result = []  # type: List[int]
     for value in ticket:
-        if not any(applies(rule=rule, value=value) for rule in rules):
+        if matching_rules(index=index, value=value) == 0:
             result.append(value)
 
     return result
@@ -118,11 +230,13 @@ def invalid_fields(rules: List[Rule], ticket: List[int]) -> List[int]:
 # fmt: on
 def list_all_invalid_values(rules: List[Rule], tickets: List[List[int]]) -> List[int]:
     """Select the invalid fields accross all ``tickets`` according to ``rules``."""
+    index = index_rules(rules=rules)
+
     result = []  # type: List[int]
 
     for ticket in tickets:
         for value in ticket:
-            if not any(applies(rule=rule, value=value) for rule in rules):
+            if matching_rules(index=index, value=value) == 0:
                 result.append(value)
 
     return result
@@ -131,3 +245,212 @@ def list_all_invalid_values(rules: List[Rule], tickets: List[List[int]]) -> List
 def compute_error_rate(invalid_values: List[int]) -> int:
     """Compute the error rate as sum of the invalid values."""
     return sum(invalid_values)
+
+
+#: Express a block of nearby tickets with values fitting in 32-bit integers
+NEARBY_TICKETS_RE = re.compile(
+    r"^(0|[1-9][0-9]{0,8})(,(0|[1-9][0-9]{0,8}))*"
+    r"(\n(0|[1-9][0-9]{0,8})(,(0|[1-9][0-9]{0,8}))*)*\Z"
+)
+
+
+class TicketMatrix(DBC):
+    """
+    Represent the nearby tickets as a matrix of field values.
+
+    The values are stored row by row in a flat array of 32-bit integers so that
+    the ticket ``i`` spans ``values[i * width:(i + 1) * width]``.
+    """
+
+    values: Final[Sequence[int]]  #: Field values of all the tickets, row by row
+    width: Final[int]  #: Number of the fields on each ticket
+    height: Final[int]  #: Number of the tickets
+
+    @require(lambda width: width >= 1)
+    @require(lambda height: height >= 0)
+    @require(lambda values, width, height: len(values) == width * height)
+    def __init__(self, values: Sequence[int], width: int, height: int) -> None:
+        """Initialize with the given values."""
+        self.values = values
+        self.width = width
+        self.height = height
+
+
+# fmt: off
+@require(lambda text: NEARBY_TICKETS_RE.match(text))
+@require(
+    lambda text:
+    len(set(line.count(",") for line in text.split("\n"))) == 1,
+    "All tickets have the same number of fields"
+)
+@ensure(
+    lambda text, result:
+    [
+        list(result.values[i * result.width:(i + 1) * result.width])
+        for i in range(result.height)
+    ] == [
+        [int(part) for part in line.split(",")]
+        for line in text.split("\n")
+    ]
+)
+# fmt: on
+def parse_nearby_ticket_matrix(text: str) -> TicketMatrix:
+    """
+    Parse the block of nearby tickets from ``text`` into a matrix in one go.
+
+    All the separators are unified so that a single split yields all the values,
+    which are then converted to integers in bulk.
+    """
+    height = text.count("\n") + 1
+    values = array.array("i", map(int, text.replace("\n", ",").split(",")))
+
+    return TicketMatrix(values=values, width=len(values) // height, height=height)
+
+
+@require(lambda matrix, position: 0 <= position < matrix.width)
+@ensure(lambda matrix, result: len(result) == matrix.height)
+def column(matrix: TicketMatrix, position: int) -> Sequence[int]:
+    """Select the values of the field at ``position`` across all the tickets."""
+    return matrix.values[position :: matrix.width]
+
+
+# fmt: off
+@ensure(
+    lambda rules, matrix, result:
+    result == list_all_invalid_values(
+        rules=rules,
+        tickets=[
+            list(matrix.values[i * matrix.width:(i + 1) * matrix.width])
+            for i in range(matrix.height)
+        ]
+    )
+)
+# fmt: on
+def list_all_invalid_values_in_matrix(
+    rules: List[Rule], matrix: TicketMatrix
+) -> List[int]:
+    """
+    Select the invalid fields in the ``matrix`` according to ``rules``.
+
+    Since the values of the tickets are usually drawn from a small domain, we look
+    up only the distinct values in the index and then filter the whole matrix
+    against the resulting set.
+    """
+    index = index_rules(rules=rules)
+
+    invalid = {
+        value
+        for value in set(matrix.values)
+        if matching_rules(index=index, value=value) == 0
+    }  # type: Set[int]
+
+    return [value for value in matrix.values if value in invalid]
+
+
+# fmt: off
+@require(lambda tickets: all(len(ticket) == len(tickets[0]) for ticket in tickets))
+@require(lambda rules, tickets: all(len(ticket) == len(rules) for ticket in tickets))
+@require(
+    lambda rules:
+    len(set(rule.identifier for rule in rules)) == len(rules)
+)
+@ensure(
+    lambda rules, result:
+    result is None
+    or sorted(result) == sorted(rule.identifier for rule in rules)
+)
+@ensure(
+    lambda rules, tickets, result:
+    result is None
+    or (
+        lambda index:
+        all(
+            any(
+                applies(rule=rule, value=ticket[position])
+                for rule in rules
+                if rule.identifier == identifier
+            )
+            for ticket in tickets
+            if all(
+                matching_rules(index=index, value=value) != 0
+                for value in ticket
+            )
+            for position, identifier in enumerate(result)
+        )
+    )(index_rules(rules=rules)),
+    "Each field matches its rule on all the valid tickets"
+)
+# fmt: on
+def determine_fields(
+    rules: List[Rule], tickets: List[List[int]]
+) -> Optional[List[str]]:
+    """
+    Determine which field corresponds to which position on the ``tickets``.
+
+    The invalid tickets are ignored. We keep a bitset of candidate rules for
+    each position and narrow it down with every ticket. Afterwards, we
+    repeatedly fix a position with a single candidate rule, or a rule with
+    a single candidate position, and eliminate it from the other candidates.
+
+    :return:
+        identifier of the field for each position, or None if the fields
+        can not be uniquely determined
+    """
+    index = index_rules(rules=rules)
+
+    # Cache the look-ups as the same values are repeated over many tickets
+    cache = dict()  # type: MutableMapping[int, int]
+
+    all_rules = (1 << len(rules)) - 1
+    candidates = [all_rules] * len(rules)
+
+    for ticket in tickets:
+        masks = []  # type: List[int]
+        for value in ticket:
+            mask = cache.get(value)
+            if mask is None:
+                mask = matching_rules(index=index, value=value)
+                cache[value] = mask
+
+            masks.append(mask)
+
+        if any(mask == 0 for mask in masks):
+            # Skip an invalid ticket
+            continue
+
+        for position, mask in enumerate(masks):
+            candidates[position] &= mask
+
+    assignment = [None] * len(rules)  # type: List[Optional[int]]
+
+    unassigned = len(rules)
+    while unassigned > 0:
+        fixed = None  # type: Optional[Tuple[int, int]]
+
+        for position, mask in enumerate(candidates):
+            if assignment[position] is None and bin(mask).count("1") == 1:
+                fixed = (position, mask.bit_length() - 1)
+                break
+
+        if fixed is None:
+            for rule_i in range(len(rules)):
+                positions = [
+                    position
+                    for position, mask in enumerate(candidates)
+                    if assignment[position] is None and (mask >> rule_i) & 1 == 1
+                ]
+                if len(positions) == 1:
+                    fixed = (positions[0], rule_i)
+                    break
+
+        if fixed is None:
+            return None
+
+        position, rule_i = fixed
+        assignment[position] = rule_i
+        unassigned -= 1
+
+        for other in range(len(candidates)):
+            candidates[other] &= ~(1 << rule_i)
+
+    return [rules[rule_i].identifier for rule_i in assignment if rule_i is not None]
@@ -1,8 +1,8 @@
 from enum import Enum
-from typing import List, Union, Optional, cast
+from typing import List, Union, Optional, cast, Mapping, Tuple
 from dataclasses import dataclass
 import regex as re
-from icontract import require, ensure
+from icontract import require, ensure, SLOW
 
 
 NUMBER_RE = re.compile(r"^(-?\d+)")
@@ -94,41 +94,270 @@ def parse(expression: str) -> Optional[Node]:
     return Node(head=head, tail=tails)
 
 
-@ensure(lambda result, node: parse(result) == node)
-def serialize(node: Node) -> str:
-    """Serialize the abstraction syntax tree given as ``node`` to a string."""
-    result = ""
-    if isinstance(node.head, int):
-        result += str(node.head)
-    else:
-        result += "({})".format(serialize(node.head))
+#: Express a single token of an expression
+TOKEN_RE = re.compile(r"(-?\d+)|([+*()])|(\s+)|(.)")
 
-    if node.tail:
-        for tail in node.tail:
-            if isinstance(tail.right, int):
-                result += "{}{}".format(tail.op.value, tail.right)
-            else:
-                result += "{}({})".format(tail.op.value, serialize(tail.right))
+
+@ensure(lambda expression, result: "".join(result) == "".join(expression.split()))
+def tokenize(expression: str) -> List[str]:
+    """
+    Split the ``expression`` into numbers, operators and parentheses in one pass.
+
+    The whitespace is skipped.
+    """
+    result = []  # type: List[str]
+    for mtch in TOKEN_RE.finditer(expression):
+        if mtch.lastindex == 4:
+            raise ValueError(f"Unexpected character at {mtch.start()}: {expression!r}")
+
+        if mtch.lastindex != 3:
+            result.append(mtch.group())
 
     return result
 
 
-def compute(node: Node) -> int:
-    """Evaluate the parsed expression given as ``node``."""
-    if isinstance(node.head, int):
-        result = node.head
-    else:
-        result = compute(node.head)
+#: Evaluate the additions before the multiplications
+ADDITION_FIRST = {
+    Operation.ADD: 2,
+    Operation.MUL: 1,
+}  # type: Mapping[Operation, int]
+
+
+@require(lambda operands, operations: len(operands) == len(operations) + 1)
+@ensure(lambda operations, result: len(result[1]) <= len(operations))
+def group_by_precedence(
+    operands: List[Union[int, Node]],
+    operations: List[Operation],
+    precedence: Optional[Mapping[Operation, int]],
+) -> Tuple[Union[int, Node], List[Tail]]:
+    """
+    Group the chain of ``operands`` and ``operations`` according to ``precedence``.
+
+    The chain is split at the operations of the lowest precedence, and each
+    part with more than one operand is grouped into a sub-:py:class:`Node`.
+    If ``precedence`` is None, all the operations are equal.
+
+    :return: head and tail of the grouped chain
+    """
+    levels = (
+        set()
+        if precedence is None
+        else set(precedence[operation] for operation in operations)
+    )
+
+    if len(levels) <= 1:
+        return operands[0], [
+            Tail(op=operation, right=operand)
+            for operation, operand in zip(operations, operands[1:])
+        ]
+
+    assert precedence is not None
+    lowest = min(levels)
 
-    for tail in node.tail:
-        if isinstance(tail.right, int):
-            right = tail.right
+    # Split the chain into parts at the operations of the lowest precedence
+    parts = [
+        ([operands[0]], [])
+    ]  # type: List[Tuple[List[Union[int, Node]], List[Operation]]]
+    splits = []  # type: List[Operation]
+
+    for operation, operand in zip(operations, operands[1:]):
+        if precedence[operation] == lowest:
+            splits.append(operation)
+            parts.append(([operand], []))
+        else:
+            parts[-1][1].append(operation)
+            parts[-1][0].append(operand)
+
+    grouped = []  # type: List[Union[int, Node]]
+    for part_operands, part_operations in parts:
+        if len(part_operands) == 1:
+            grouped.append(part_operands[0])
+        else:
+            head, tail = group_by_precedence(
+                operands=part_operands,
+                operations=part_operations,
+                precedence=precedence,
+            )
+            grouped.append(Node(head=head, tail=tail))
+
+    return grouped[0], [
+        Tail(op=operation, right=operand)
+        for operation, operand in zip(splits, grouped[1:])
+    ]
+
+
+# fmt: off
+@ensure(
+    lambda expression, precedence, result:
+    not (precedence is None or len(set(precedence.values())) <= 1)
+    or result == parse("".join(expression.split())),
+    "Same tree as the recursive parser if all operations are equal",
+    enabled=SLOW
+)
+# fmt: on
+def parse_iteratively(
+    expression: str, precedence: Optional[Mapping[Operation, int]] = None
+) -> Optional[Node]:
+    """
+    Parse the ``expression`` into an abstract syntax tree in linear time.
+
+    The expression is tokenized in a single pass, and the parentheses are
+    tracked with an explicit stack instead of recursion.
+
+    If ``precedence`` is given, the operations of higher precedence are grouped
+    into sub-nodes so that the tree can be computed from left to right.
+    For example, ``1+2*3+4`` is parsed as ``(1+2)*(3+4)`` with
+    :py:data:`ADDITION_FIRST`.
+    """
+    tokens = tokenize(expression)
+    if len(tokens) == 0:
+        return None
+
+    # Each frame holds the operands and operations of an open parenthesis.
+    stack = [([], [])]  # type: List[Tuple[List[Union[int, Node]], List[Operation]]]
+
+    expect_operand = True
+
+    for token in tokens:
+        operands, operations = stack[-1]
+
+        if expect_operand:
+            if token == "(":
+                stack.append(([], []))
+            elif token not in ("+", "*", ")"):
+                operands.append(int(token))
+                expect_operand = False
+            else:
+                raise ValueError(f"Unexpected {token!r} in: {expression!r}")
         else:
-            right = compute(tail.right)
+            if token in ("+", "*"):
+                operations.append(Operation(token))
+                expect_operand = True
+            elif token == ")" and len(stack) > 1:
+                stack.pop()
+                head, tail = group_by_precedence(
+                    operands=operands, operations=operations, precedence=precedence
+                )
+                stack[-1][0].append(Node(head=head, tail=tail))
+            else:
+                raise ValueError(f"Unexpected {token!r} in: {expression!r}")
 
-        if tail.op == Operation.ADD:
-            result += right
+    if expect_operand or len(stack) != 1:
+        raise ValueError(f"Unexpected end of the expression: {expression!r}")
+
+    operands, operations = stack[0]
+    head, tail = group_by_precedence(
+        operands=operands, operations=operations, precedence=precedence
+    )
+    return Node(head=head, tail=tail)
+
+
+def _serialize(node: Node) -> str:
+    """
+    Serialize the ``node`` by traversing it with an explicit stack.
+
+    Arbitrary deep nesting does not hit the recursion limit this way.
+    """
+    parts = []  # type: List[str]
+
+    # The stack holds the literal parts and the nodes yet to be expanded.
+    stack = [node]  # type: List[Union[str, Node]]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+
+        expansion = []  # type: List[Union[str, Node]]
+        if isinstance(item.head, int):
+            expansion.append(str(item.head))
         else:
-            result *= right
+            expansion.extend(["(", item.head, ")"])
+
+        for tail in item.tail:
+            expansion.append(tail.op.value)
+            if isinstance(tail.right, int):
+                expansion.append(str(tail.right))
+            else:
+                expansion.extend(["(", tail.right, ")"])
+
+        stack.extend(reversed(expansion))
+
+    return "".join(parts)
+
+
+@ensure(lambda result, node: parse(result) == node, enabled=SLOW)
+def serialize(node: Node) -> str:
+    """
+    Serialize the abstraction syntax tree given as ``node`` to a string.
+
+    The tree is traversed iteratively, see :py:func:`_serialize`.
+    """
+    return _serialize(node)
+
+
+#: Represent an instruction of a compiled expression in postfix notation
+Instruction = Union[int, Operation]
+
+
+# fmt: off
+@ensure(
+    lambda result:
+    sum(1 for instruction in result if isinstance(instruction, int))
+    == sum(1 for instruction in result if isinstance(instruction, Operation)) + 1,
+    "Every operation consumes two operands and produces one"
+)
+# fmt: on
+def compile_to_postfix(node: Node) -> List[Instruction]:
+    """
+    Compile the abstract syntax tree given as ``node`` into postfix notation.
+
+    For example, ``(1+2)*3`` is compiled to ``1 2 + 3 *``.
+    """
+    result = []  # type: List[Instruction]
+
+    # The stack holds the instructions and the nodes yet to be expanded.
+    stack = [node]  # type: List[Union[Instruction, Node]]
+    while stack:
+        item = stack.pop()
+        if not isinstance(item, Node):
+            result.append(item)
+            continue
+
+        expansion = [item.head]  # type: List[Union[Instruction, Node]]
+        for tail in item.tail:
+            expansion.append(tail.right)
+            expansion.append(tail.op)
+
+        stack.extend(reversed(expansion))
 
     return result
+
+
+@require(lambda program: len(program) > 0)
+def evaluate_postfix(program: List[Instruction]) -> int:
+    """Evaluate the ``program`` given in postfix notation in a single loop."""
+    values = []  # type: List[int]
+    for instruction in program:
+        if isinstance(instruction, Operation):
+            right = values.pop()
+            left = values.pop()
+            if instruction == Operation.ADD:
+                values.append(left + right)
+            else:
+                values.append(left * right)
+        else:
+            values.append(instruction)
+
+    assert len(values) == 1
+    return values[0]
+
+
+def compute(node: Node) -> int:
+    """
+    Evaluate the parsed expression given as ``node``.
+
+    The expression is compiled into postfix notation first so that arbitrary
+    deep nesting does not hit the recursion limit.
+    """
+    return evaluate_postfix(program=compile_to_postfix(node=node))
@@ -1,7 +1,7 @@
 import sys
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Set, Sequence
 
-from icontract import ensure
+from icontract import ensure, require
 
 
 @ensure(
@@ -19,14 +19,113 @@ from icontract import ensure
     "A duplicated result was produced from different input items",
 )
 def find_pair_with_sum(items: List[int], total: int) -> Optional[Tuple[int, int]]:
-    """Find the two entries that sum to ``total``."""
-    for i, x in enumerate(items):
-        for y in items[i + 1 :]:
-            if x + y == total:
-                return (x, y)
+    """
+    Find the two entries that sum to ``total``.
+
+    We remember the entries seen so far in a set so that the complement of
+    each entry is looked up in constant time.
+    """
+    seen = set()  # type: Set[int]
+    for y in items:
+        x = total - y
+        if x in seen:
+            return (x, y)
+
+        seen.add(y)
+
     return None
 
 
+# fmt: off
+@require(lambda items: all(
+    items[i] <= items[i + 1] for i in range(len(items) - 1)))
+@require(lambda items, start: 0 <= start <= len(items))
+@require(lambda k: k >= 2)
+@ensure(
+    lambda result, total: result is None or sum(result) == total,
+    "Returned items sum to the right total"
+)
+@ensure(
+    lambda k, result: result is None or len(result) == k,
+    "Exactly k items returned"
+)
+# fmt: on
+def _find_tuple_in_sorted(
+    items: Sequence[int], start: int, total: int, k: int
+) -> Optional[Tuple[int, ...]]:
+    """
+    Find ``k`` entries in ``items[start:]`` that sum to ``total``.
+
+    The ``items`` need to be sorted so that we can close in on the last pair with
+    two pointers, and fix the remaining ``k - 2`` entries one by one.
+    """
+    if k == 2:
+        left = start
+        right = len(items) - 1
+        while left < right:
+            pair_sum = items[left] + items[right]
+            if pair_sum == total:
+                return items[left], items[right]
+
+            if pair_sum < total:
+                left += 1
+            else:
+                right -= 1
+
+        return None
+
+    for i in range(start, len(items) - k + 1):
+        # Skip the duplicates as they would yield the same tuples.
+        if i > start and items[i] == items[i - 1]:
+            continue
+
+        rest = _find_tuple_in_sorted(
+            items=items, start=i + 1, total=total - items[i], k=k - 1
+        )
+        if rest is not None:
+            return (items[i],) + rest
+
+    return None
+
+
+@require(lambda k: k >= 1)
+@ensure(
+    lambda result, total: result is None or sum(result) == total,
+    "Returned items sum to the right total",
+)
+@ensure(
+    lambda result, k: result is None or len(result) == k,
+    "Exactly k items returned",
+)
+@ensure(
+    lambda result, items: result is None or all(r in items for r in result),
+    "Returned values appear in the input",
+)
+@ensure(
+    lambda result, items: result is None
+    or all(result.count(r) <= items.count(r) for r in result),
+    "A duplicated result was produced from different input items",
+)
+def find_tuple_with_sum(
+    items: List[int], total: int, k: int
+) -> Optional[Tuple[int, ...]]:
+    """
+    Find the ``k`` entries that sum to ``total``.
+
+    For pairs we rely on :py:func:`find_pair_with_sum`, while for larger tuples
+    we sort the entries first and search with two pointers in
+    ``O(len(items) ** (k - 1))``.
+    """
+    if k == 1:
+        return (total,) if total in items else None
+
+    if k == 2:
+        return find_pair_with_sum(items=items, total=total)
+
+    return _find_tuple_in_sorted(items=sorted(items), start=0, total=total, k=k)
+
+
 if __name__ == "__main__":
     entries = list(map(int, sys.stdin.read().split()))
     print(find_pair_with_sum(entries, 2020))
+    print(find_tuple_with_sum(entries, 2020, 3))
@@ -14,10 +14,13 @@ from typing import (
     overload,
     Union,
     Iterator,
+    Iterable,
 )
 
 from icontract import require, ensure, DBC
 
+from python_by_contract_corpus.common import MappedLines, split_on_blank_lines
+
 VALID_SIDE_RE = re.compile(r"[.#]{10}")  #: Express the edge of a tile
 
 
@@ -258,9 +261,29 @@ def parse_tiles(text: str) -> Dict[int, Set[Tile]]:
     return tiles
 
 
+def parse_tiles_from_lines(lines: Iterable[str]) -> Dict[int, Set[Tile]]:
+    """Parse the tiles separated by blank ``lines`` consumed one at a time."""
+    tiles: Dict[int, Set[Tile]] = {}
+    for section in split_on_blank_lines(lines):
+        tile_id, tile = parse_tile(ValidTileText(section))
+        tiles[tile_id] = transform_tile(tile)
+
+    return tiles
+
+
 def main() -> None:
-    """Execute the main routine."""
-    tiles = parse_tiles(sys.stdin.read())
+    """
+    Execute the main routine.
+
+    The input is read from the file given as the first argument, if any, and
+    from the standard input otherwise.
+    """
+    if len(sys.argv) > 1:
+        with MappedLines(sys.argv[1]) as lines:
+            tiles = parse_tiles_from_lines(lines)
+    else:
+        tiles = parse_tiles(sys.stdin.read())
+
     image = place_tiles(tiles)
     assert image is not None
     ids = [tid for tid, _ in image.tiles]
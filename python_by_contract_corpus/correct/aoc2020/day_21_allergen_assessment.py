@@ -1,5 +1,5 @@
 import re
-from typing import List, Set, cast, MutableMapping
+from typing import List, Set, cast, MutableMapping, Final, Mapping, Optional
 
 from icontract import require, ensure, DBC
 
@@ -135,3 +135,228 @@ def solve(lines: List[IngredientLine]) -> Set[Ingredient]:
     entries = [parse_ingredient_line(line) for line in lines]
 
     return find_non_allergenic_ingredients(entries=entries)
+
+
+class FoodIndex(DBC):
+    """
+    Represent the entries with the identifiers interned as small integers.
+
+    The ingredients and allergens of each entry are given as bitsets where
+    the bit ``i`` stands for ``ingredients[i]`` and ``allergens[i]``, respectively.
+    """
+
+    ingredients: Final[List[Ingredient]]  #: Interned ingredients
+    allergens: Final[List[Allergen]]  #: Interned allergens
+
+    #: Number of the entries listing each ingredient
+    ingredient_counts: Final[List[int]]
+
+    #: Bitset of the ingredients for each entry
+    entry_ingredients: Final[List[int]]
+
+    #: Bitset of the allergens for each entry
+    entry_allergens: Final[List[int]]
+
+    @require(lambda ingredients: len(set(ingredients)) == len(ingredients))
+    @require(lambda allergens: len(set(allergens)) == len(allergens))
+    @require(
+        lambda ingredients, ingredient_counts: (
+            len(ingredient_counts) == len(ingredients)
+        )
+    )
+    @require(
+        lambda entry_ingredients, entry_allergens: (
+            len(entry_ingredients) == len(entry_allergens)
+        )
+    )
+    @require(
+        lambda ingredients, entry_ingredients: all(
+            0 <= bitset < (1 << len(ingredients)) for bitset in entry_ingredients
+        )
+    )
+    @require(
+        lambda allergens, entry_allergens: all(
+            0 <= bitset < (1 << len(allergens)) for bitset in entry_allergens
+        )
+    )
+    def __init__(
+        self,
+        ingredients: List[Ingredient],
+        allergens: List[Allergen],
+        ingredient_counts: List[int],
+        entry_ingredients: List[int],
+        entry_allergens: List[int],
+    ) -> None:
+        """Initialize with the given values."""
+        self.ingredients = ingredients
+        self.allergens = allergens
+        self.ingredient_counts = ingredient_counts
+        self.entry_ingredients = entry_ingredients
+        self.entry_allergens = entry_allergens
+
+
+# fmt: off
+@ensure(
+    lambda entries, result:
+    set(result.ingredients) == set(
+        ingredient for entry in entries for ingredient in entry.ingredients
+    )
+)
+@ensure(
+    lambda entries, result:
+    set(result.allergens) == set(
+        allergen for entry in entries for allergen in entry.allergens
+    )
+)
+@ensure(lambda entries, result: len(result.entry_ingredients) == len(entries))
+# fmt: on
+def index_foods(entries: List[Entry]) -> FoodIndex:
+    """Intern the identifiers of the ``entries`` and represent them as bitsets."""
+    ingredient_ids = dict()  # type: MutableMapping[Ingredient, int]
+    allergen_ids = dict()  # type: MutableMapping[Allergen, int]
+
+    ingredient_counts = []  # type: List[int]
+    entry_ingredients = []  # type: List[int]
+    entry_allergens = []  # type: List[int]
+
+    for entry in entries:
+        ingredient_bitset = 0
+        for ingredient in entry.ingredients:
+            ingredient_id = ingredient_ids.setdefault(ingredient, len(ingredient_ids))
+            if ingredient_id == len(ingredient_counts):
+                ingredient_counts.append(0)
+
+            ingredient_counts[ingredient_id] += 1
+            ingredient_bitset |= 1 << ingredient_id
+
+        allergen_bitset = 0
+        for allergen in entry.allergens:
+            allergen_bitset |= 1 << allergen_ids.setdefault(allergen, len(allergen_ids))
+
+        entry_ingredients.append(ingredient_bitset)
+        entry_allergens.append(allergen_bitset)
+
+    return FoodIndex(
+        ingredients=list(ingredient_ids.keys()),
+        allergens=list(allergen_ids.keys()),
+        ingredient_counts=ingredient_counts,
+        entry_ingredients=entry_ingredients,
+        entry_allergens=entry_allergens,
+    )
+
+
+@ensure(lambda index, result: len(result) == len(index.allergens))
+def determine_candidates(index: FoodIndex) -> List[int]:
+    """
+    Determine the candidate ingredients for each allergen in the ``index``.
+
+    :return:
+        bitset of the ingredients which appear in all the entries listing
+        the allergen, for each allergen
+    """
+    result = [(1 << len(index.ingredients)) - 1] * len(index.allergens)
+
+    for ingredient_bitset, allergen_bitset in zip(
+        index.entry_ingredients, index.entry_allergens
+    ):
+        while allergen_bitset != 0:
+            bit = allergen_bitset & -allergen_bitset
+            allergen_bitset ^= bit
+
+            allergen_id = bit.bit_length() - 1
+            result[allergen_id] &= ingredient_bitset
+
+    return result
+
+
+# fmt: off
+@ensure(
+    lambda entries, result:
+    (
+        lambda non_allergenic:
+        result == sum(
+            1
+            for entry in entries
+            for ingredient in entry.ingredients
+            if ingredient in non_allergenic
+        )
+    )(find_non_allergenic_ingredients(entries))
+)
+# fmt: on
+def count_non_allergenic_occurrences(entries: List[Entry]) -> int:
+    """Count how many times the ingredients without allergens appear in ``entries``."""
+    index = index_foods(entries=entries)
+
+    allergenic = 0
+    for candidates in determine_candidates(index=index):
+        allergenic |= candidates
+
+    return sum(
+        count
+        for ingredient_id, count in enumerate(index.ingredient_counts)
+        if (allergenic >> ingredient_id) & 1 == 0
+    )
+
+
+# fmt: off
+@ensure(
+    lambda result:
+    result is None
+    or len(set(result.values())) == len(result),
+    "Each ingredient contains at most one allergen"
+)
+@ensure(
+    lambda entries, result:
+    result is None
+    or all(
+        result[allergen] in entry.ingredients
+        for entry in entries
+        for allergen in entry.allergens
+    ),
+    "The ingredient of an allergen is listed wherever the allergen is"
+)
+# fmt: on
+def resolve_allergens(entries: List[Entry]) -> Optional[Mapping[Allergen, Ingredient]]:
+    """
+    Determine which ingredient contains which allergen.
+
+    We repeatedly pick an allergen with a single candidate ingredient and
+    eliminate that ingredient from the candidates of all the other allergens.
+
+    :return: Map allergen 🠒 ingredient, or None if it is not unique
+    """
+    index = index_foods(entries=entries)
+    candidates = determine_candidates(index=index)
+
+    result = dict()  # type: MutableMapping[Allergen, Ingredient]
+
+    unresolved = set(range(len(index.allergens)))
+    while unresolved:
+        singleton = next(
+            (
+                allergen_id
+                for allergen_id in unresolved
+                if candidates[allergen_id] != 0
+                and candidates[allergen_id] & (candidates[allergen_id] - 1) == 0
+            ),
+            None,
+        )
+        if singleton is None:
+            return None
+
+        unresolved.remove(singleton)
+
+        ingredient_bit = candidates[singleton]
+        result[index.allergens[singleton]] = index.ingredients[
+            ingredient_bit.bit_length() - 1
+        ]
+
+        for allergen_id in unresolved:
+            candidates[allergen_id] &= ~ingredient_bit
+
+    return result
+
+
+def list_dangerous_ingredients(mapping: Mapping[Allergen, Ingredient]) -> str:
+    """List the ingredients of ``mapping`` sorted alphabetically by their allergen."""
+    return ",".join(mapping[allergen] for allergen in sorted(mapping.keys()))
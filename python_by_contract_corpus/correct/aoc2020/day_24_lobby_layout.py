@@ -1,9 +1,10 @@
+import array
 import collections
 import enum
 import re
-from typing import Tuple, List, MutableMapping, Final
+from typing import Tuple, List, MutableMapping, Final, Mapping, Set, Sequence
 
-from icontract import require, ensure, DBC
+from icontract import require, ensure, DBC, SLOW
 
 
 # crosshair: on
@@ -127,3 +128,281 @@ def count_flips(plan: List[List[Direction]]) -> int:
 
     # Count the blacks which correspond to False.
     return sum(1 for value in state.values() if not value)
+
+
+#: Map :py:class:`Direction` 🠒 delta in axial coordinates ``(q, r)``.
+#:
+#: The axial coordinate ``q`` corresponds to :py:attr:`Cell.x` and ``r``
+#: corresponds to :py:attr:`Cell.z`. The third cube coordinate is implicit.
+DIRECTION_TO_DELTA = {
+    Direction.EAST: (1, 0),
+    Direction.SOUTH_EAST: (0, 1),
+    Direction.SOUTH_WEST: (-1, 1),
+    Direction.WEST: (-1, 0),
+    Direction.NORTH_WEST: (0, -1),
+    Direction.NORTH_EAST: (1, -1),
+}  # type: Mapping[Direction, Tuple[int, int]]
+
+assert len(DIRECTION_TO_DELTA) == len(Direction)
+
+
+def cell_as_axial(cell: Cell) -> Tuple[int, int]:
+    """Convert the :py:class:`cell` into a tuple of axial coordinates q and r."""
+    return cell.x, cell.z
+
+
+# fmt: off
+@ensure(
+    lambda directions, result:
+    cell_as_axial(
+        follow_directions(start=Cell(x=0, y=0, z=0), directions=directions)
+    ) == result,
+    enabled=SLOW
+)
+# fmt: on
+def follow_directions_axially(directions: List[Direction]) -> Tuple[int, int]:
+    """
+    Walk the ``directions`` from the cell zero without creating intermediate cells.
+
+    :return: The axial coordinates ``(q, r)`` of the final cell
+    """
+    q = 0
+    r = 0
+    for direction in directions:
+        delta_q, delta_r = DIRECTION_TO_DELTA[direction]
+        q += delta_q
+        r += delta_r
+
+    return q, r
+
+
+#: Stride between two consecutive ``q`` coordinates of a packed cell
+PACK_STRIDE = 1 << 32
+
+#: Bound on the absolute value of axial coordinates which can be packed
+PACK_BOUND = PACK_STRIDE >> 2
+
+
+@require(lambda q: -PACK_BOUND < q < PACK_BOUND)
+@require(lambda r: -PACK_BOUND < r < PACK_BOUND)
+@ensure(lambda q, r, result: unpack_cell(result) == (q, r))
+def pack_cell(q: int, r: int) -> int:
+    """
+    Pack the axial coordinates ``q`` and ``r`` into a single integer.
+
+    The neighbours of a packed cell can be computed by simply adding
+    the packed deltas (see :py:data:`PACKED_DELTAS`).
+    """
+    return q * PACK_STRIDE + r
+
+
+def unpack_cell(key: int) -> Tuple[int, int]:
+    """Unpack the axial coordinates ``(q, r)`` from a cell packed as ``key``."""
+    r = (key + PACK_STRIDE // 2) % PACK_STRIDE - PACK_STRIDE // 2
+    q = (key - r) // PACK_STRIDE
+    return q, r
+
+
+#: Deltas in packed coordinates to all the six neighbours of a cell
+PACKED_DELTAS = tuple(
+    delta_q * PACK_STRIDE + delta_r for delta_q, delta_r in DIRECTION_TO_DELTA.values()
+)
+
+
+# fmt: off
+@ensure(
+    lambda plan, result:
+    len(result) == count_flips(plan),
+    "Fast path consistent with the cell-by-cell walk",
+    enabled=SLOW
+)
+# fmt: on
+def flip_tiles(plan: List[List[Direction]]) -> Set[int]:
+    """
+    Flip the tiles according to the ``plan`` starting from all-white floor.
+
+    :return: The packed coordinates of the black tiles
+    """
+    black = set()  # type: Set[int]
+    for directions in plan:
+        key = pack_cell(*follow_directions_axially(directions=directions))
+
+        if key in black:
+            black.remove(key)
+        else:
+            black.add(key)
+
+    return black
+
+
+def apply_day(black: Set[int]) -> Set[int]:
+    """
+    Apply the daily flipping rules to the ``black`` tiles.
+
+    A black tile with zero or more than two black neighbours becomes white,
+    while a white tile with exactly two black neighbours becomes black.
+
+    :return: The packed coordinates of the black tiles on the next day
+    """
+    votes = collections.Counter(
+        key + delta for key in black for delta in PACKED_DELTAS
+    )  # type: MutableMapping[int, int]
+
+    return {
+        key
+        for key, black_neighbours in votes.items()
+        if black_neighbours == 2 or (black_neighbours == 1 and key in black)
+    }
+
+
+@require(lambda days: days >= 0)
+@ensure(lambda result: result >= 0)
+def simulate_days(plan: List[List[Direction]], days: int) -> int:
+    """
+    Lay out the tiles according to the ``plan`` and flip them for ``days``.
+
+    :return: The number of black tiles after the given number of days
+    """
+    black = flip_tiles(plan=plan)
+    for _ in range(days):
+        black = apply_day(black=black)
+
+    return len(black)
+
+
+#: Map direction code 🠒 :py:class:`Direction`
+CODE_TO_DIRECTION = tuple(Direction)
+
+#: Map string literal of :py:class:`Direction` 🠒 direction code
+VALUE_TO_CODE = dict(
+    (direction.value, code) for code, direction in enumerate(CODE_TO_DIRECTION)
+)
+
+#: Express the directions of many lines, each line possibly empty
+BATCH_RE = re.compile(r"^((se|sw|nw|ne|w|e)*\n)*(se|sw|nw|ne|w|e)*\Z")
+
+#: Express a single token of a batch, *i.e.*, a direction or a line break
+TOKEN_RE = re.compile(r"se|sw|nw|ne|w|e|\n")
+
+
+class DirectionBatch(DBC):
+    """
+    Represent compactly the directions of many lines.
+
+    The directions are given as codes (see :py:data:`CODE_TO_DIRECTION`) of
+    all the lines concatenated together. The directions of the line ``i`` are
+    found in ``codes[offsets[i]:offsets[i + 1]]``.
+    """
+
+    codes: Final[bytes]  #: Direction codes of all the lines
+    offsets: Final[Sequence[int]]  #: Start of each line, and the end of codes
+
+    @require(lambda codes: all(code < len(CODE_TO_DIRECTION) for code in codes))
+    @require(lambda offsets: len(offsets) >= 1 and offsets[0] == 0)
+    @require(lambda codes, offsets: offsets[-1] == len(codes))
+    # fmt: off
+    @require(
+        lambda offsets:
+        all(
+            start <= end
+            for start, end in zip(offsets, offsets[1:])
+        )
+    )
+    # fmt: on
+    def __init__(self, codes: bytes, offsets: Sequence[int]) -> None:
+        """Initialize with the given values."""
+        self.codes = codes
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        """Return the number of the lines."""
+        return len(self.offsets) - 1
+
+
+@require(lambda batch, index: 0 <= index < len(batch))
+def decode_line(batch: DirectionBatch, index: int) -> List[Direction]:
+    """Decode the directions of the line given with ``index`` in the ``batch``."""
+    start = batch.offsets[index]
+    end = batch.offsets[index + 1]
+    return [CODE_TO_DIRECTION[code] for code in batch.codes[start:end]]
+
+
+@require(lambda text: BATCH_RE.match(text))
+@ensure(lambda text, result: len(result) == len(text.splitlines()))
+# fmt: off
+@ensure(
+    lambda text, result:
+    all(
+        decode_line(batch=result, index=index) == parse_line(line)
+        for index, line in enumerate(text.splitlines())
+    ),
+    "Round-trip with the line-by-line parsing",
+    enabled=SLOW
+)
+# fmt: on
+def parse_batch(text: str) -> DirectionBatch:
+    """
+    Parse all the lines of the ``text`` in a single pass.
+
+    The ``text`` might end with a line break or not.
+    """
+    codes = bytearray()
+    offsets = array.array("q", [0])
+
+    for token in TOKEN_RE.findall(text):
+        if token == "\n":
+            offsets.append(len(codes))
+        else:
+            codes.append(VALUE_TO_CODE[token])
+
+    if len(text) > 0 and not text.endswith("\n"):
+        offsets.append(len(codes))
+
+    return DirectionBatch(codes=bytes(codes), offsets=offsets)
+
+
+#: Axial delta ``q`` indexed by direction code
+CODE_TO_DELTA_Q = tuple(DIRECTION_TO_DELTA[direction][0] for direction in Direction)
+
+#: Axial delta ``r`` indexed by direction code
+CODE_TO_DELTA_R = tuple(DIRECTION_TO_DELTA[direction][1] for direction in Direction)
+
+
+# fmt: off
+@ensure(
+    lambda batch, result:
+    all(
+        follow_directions_axially(decode_line(batch=batch, index=index)) == cell
+        for index, cell in enumerate(result)
+    ),
+    enabled=SLOW
+)
+# fmt: on
+@ensure(lambda batch, result: len(result) == len(batch))
+def follow_batch_axially(batch: DirectionBatch) -> List[Tuple[int, int]]:
+    """
+    Walk the directions of each line of the ``batch`` from the cell zero.
+
+    Since the order of the directions does not matter for the final cell,
+    we only count how many times each direction appears on the line.
+
+    :return: The axial coordinates ``(q, r)`` of the final cell of each line
+    """
+    result = []  # type: List[Tuple[int, int]]
+
+    codes = batch.codes
+    offsets = batch.offsets
+    for index in range(len(offsets) - 1):
+        start = offsets[index]
+        end = offsets[index + 1]
+
+        q = 0
+        r = 0
+        for code in range(len(CODE_TO_DIRECTION)):
+            count = codes.count(code, start, end)
+            q += count * CODE_TO_DELTA_Q[code]
+            r += count * CODE_TO_DELTA_R[code]
+
+        result.append((q, r))
+
+    return result
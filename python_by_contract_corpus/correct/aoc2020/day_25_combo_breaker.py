@@ -1,43 +1,96 @@
+import math
+from typing import MutableMapping
+
 from icontract import require, ensure
 
+#: Modulus of the hard-coded transformation algorithm
+MODULUS = 20201227
+
+#: Subject number used by the card and the door to generate the public keys
+SUBJECT = 7
+
 
 @require(lambda loop_size: loop_size >= 0)
 @require(lambda subject: subject >= 0)
-@ensure(lambda result: 0 <= result < 20201227)
-def transform(subject: int, loop_size: int) -> int:
+@require(lambda modulus: modulus >= 2)
+@ensure(lambda result, modulus: 0 <= result < modulus)
+def transform(subject: int, loop_size: int, modulus: int = MODULUS) -> int:
     """Transform the ``subject`` in ``loop_size`` steps of a hard-coded algorithm."""
-    value = 1
-    for _ in range(loop_size):
-        value *= subject
-        value %= 20201227
-    return value
+    return pow(subject, loop_size, modulus)
 
 
 # fmt: off
 @require(lambda subject: subject >= 0)
+@require(lambda modulus: modulus >= 2)
+@require(
+    lambda subject, modulus:
+    subject % modulus == 0 or math.gcd(subject, modulus) == 1,
+    "Subject either vanishes or is invertible modulo the modulus"
+)
 @ensure(
-    lambda result, subject, public_key:
-    not (result != -1) or transform(subject, result) == public_key
+    lambda result, subject, public_key, modulus:
+    not (result != -1) or transform(subject, result, modulus) == public_key
 )
+@ensure(lambda result, modulus: -1 <= result < modulus)
 # fmt: on
-def deduce_loop_size(subject: int, public_key: int) -> int:
+def deduce_loop_size(subject: int, public_key: int, modulus: int = MODULUS) -> int:
     """
     Deduce the loop size for ``public_key`` by transforming the ``subject``.
 
-    :return: The loop size, or -1 if no success
+    We solve the discrete logarithm with the baby-step giant-step algorithm.
+    Namely, we write the loop size as ``i * m + j`` with ``m`` close to the square
+    root of the ``modulus``, tabulate all the baby steps ``subject ** j`` and then
+    take giant steps ``public_key * subject ** (-i * m)`` until we hit the table.
+
+    :return: The smallest loop size, or -1 if no success
     """
+    if not (0 <= public_key < modulus):
+        return -1
+
+    if public_key == 1:
+        return 0
+
+    if subject % modulus == 0:
+        return 1 if public_key == 0 else -1
+
+    step_count = math.isqrt(modulus - 1) + 1
+
+    baby_steps = dict()  # type: MutableMapping[int, int]
     value = 1
-    for loop_ct in range(100000000):
-        if value == public_key:
-            return loop_ct
-        value *= subject
-        value %= 20201227
+    for j in range(step_count):
+        baby_steps.setdefault(value, j)
+        value = value * subject % modulus
+
+    giant_factor = pow(subject, -step_count, modulus)
+
+    value = public_key
+    for i in range(step_count):
+        baby_exponent = baby_steps.get(value)
+        if baby_exponent is not None:
+            return i * step_count + baby_exponent
+
+        value = value * giant_factor % modulus
+
     return -1
 
 
 @require(lambda door_public_key: door_public_key >= 0)
 @require(lambda card_public_key: card_public_key >= 0)
-def deduce_encryption_key(door_public_key: int, card_public_key: int) -> int:
+@require(lambda subject: subject >= 0)
+@require(lambda modulus: modulus >= 2)
+# fmt: off
+@require(
+    lambda subject, modulus:
+    subject % modulus == 0 or math.gcd(subject, modulus) == 1,
+    "Subject either vanishes or is invertible modulo the modulus"
+)
+# fmt: on
+def deduce_encryption_key(
+    door_public_key: int,
+    card_public_key: int,
+    subject: int = SUBJECT,
+    modulus: int = MODULUS,
+) -> int:
     """Figure out the subject number."""
-    card_loop_size = deduce_loop_size(7, card_public_key)
-    return transform(door_public_key, card_loop_size)
+    card_loop_size = deduce_loop_size(subject, card_public_key, modulus)
+    return transform(door_public_key, card_loop_size, modulus)
@@ -1,5 +1,7 @@
+import enum
+import mmap
 import re
-from typing import Optional
+from typing import Optional, Iterator, List, Match, AnyStr
 
 from icontract import require, ensure
 
@@ -42,3 +44,144 @@ def verify(min_count: int, max_count: int, character: str, password: str) -> boo
     # crosshair: on
     answer = min_count <= password.count(character) <= max_count
     return answer
+
+
+@require(lambda first: first > 0)
+@require(lambda second: second > 0)
+@require(lambda character: len(character) == 1)
+# fmt: off
+@ensure(
+    lambda first, second, character, password, result:
+    result == (
+        (len(password) >= first and password[first - 1] == character)
+        != (len(password) >= second and password[second - 1] == character)
+    )
+)
+# fmt: on
+def verify_positions(first: int, second: int, character: str, password: str) -> bool:
+    """Verify that exactly one of the 1-based positions holds the ``character``."""
+    return (password[first - 1 : first] == character) != (
+        password[second - 1 : second] == character
+    )
+
+
+@require(lambda line: ENTRY_RE.match(line))
+def verify_line_positions(line: str) -> bool:
+    """Verify an entry of the password database by the positions of the character."""
+    mtch = ENTRY_RE.match(line)
+    assert mtch is not None
+
+    return verify_positions(
+        first=int(mtch.group("min_count")),
+        second=int(mtch.group("max_count")),
+        character=mtch.group("character"),
+        password=mtch.group("password"),
+    )
+
+
+class Policy(enum.Enum):
+    """Represent how the two numbers of an entry constrain the password."""
+
+    #: The numbers bound the count of the character
+    COUNT = "count"
+
+    #: Exactly one of the two positions holds the character
+    POSITION = "position"
+
+
+#: Entries of the whole database as text, optionally followed by a carriage return
+DATABASE_RE = re.compile(
+    r"^([1-9][0-9]*)-([1-9][0-9]*) ([a-z]): ([a-z]+)\r?$", re.MULTILINE
+)
+
+#: Entries of the whole database as bytes, optionally followed by a carriage return
+DATABASE_BYTES_RE = re.compile(
+    rb"^([1-9][0-9]*)-([1-9][0-9]*) ([a-z]): ([a-z]+)\r?$", re.MULTILINE
+)
+
+
+def _count_valid(matches: Iterator[Match[AnyStr]], policy: Policy) -> int:
+    """Count the valid entries among the ``matches`` of the database patterns."""
+    count = 0
+
+    if policy == Policy.COUNT:
+        for match in matches:
+            low, high, character, password = match.groups()
+            if int(low) <= password.count(character) <= int(high):
+                count += 1
+
+    elif policy == Policy.POSITION:
+        for match in matches:
+            low, high, character, password = match.groups()
+            first = int(low)
+            second = int(high)
+            if (password[first - 1 : first] == character) != (
+                password[second - 1 : second] == character
+            ):
+                count += 1
+
+    else:
+        raise NotImplementedError(policy)
+
+    return count
+
+
+def _split_database_lines(text: str) -> List[str]:
+    """Split the ``text`` into the entries the same way as :py:data:`DATABASE_RE`."""
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+
+    return [line[:-1] if line.endswith("\r") else line for line in lines]
+
+
+# fmt: off
+@require(
+    lambda text:
+    all(ENTRY_RE.match(line) for line in _split_database_lines(text))
+)
+@ensure(
+    lambda text, policy, result:
+    result == sum(
+        1
+        for line in _split_database_lines(text)
+        if (
+            verify_line(line) if policy == Policy.COUNT
+            else verify_line_positions(line)
+        )
+    )
+)
+# fmt: on
+def count_valid_passwords(text: str, policy: Policy) -> int:
+    r"""
+    Count the valid passwords of the database ``text`` in a single pass.
+
+    The entries can be separated either by ``\n`` or ``\r\n``.
+    """
+    return _count_valid(DATABASE_RE.finditer(text), policy)
+
+
+@ensure(lambda result: result >= 0)
+def count_valid_passwords_in_file(
+    path: str, policy: Policy, use_mmap: bool = True
+) -> int:
+    """
+    Count the valid passwords of the database file at ``path``.
+
+    With ``use_mmap`` the pattern runs directly on the memory-mapped file so that
+    it is neither read nor decoded into Python strings. The lines which are not
+    valid entries are skipped.
+    """
+    with open(path, "rb") as file:
+        if not use_mmap:
+            return _count_valid(DATABASE_BYTES_RE.finditer(file.read()), policy)
+
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can not be memory-mapped.
+            return 0
+
+        with data:
+            # mmap supports the buffer protocol, which is all the pattern needs.
+            return _count_valid(DATABASE_BYTES_RE.finditer(data), policy)
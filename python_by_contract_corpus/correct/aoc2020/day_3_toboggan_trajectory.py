@@ -1,7 +1,10 @@
+import concurrent.futures
+import mmap
+import os
 import re
-from typing import Tuple, cast, Sequence
+from typing import Tuple, cast, Sequence, List, Union
 
-from icontract import ensure, require, DBC
+from icontract import ensure, require, DBC, SLOW
 
 STEP_SIZE_HORIZONTAL: int = 3
 STEP_SIZE_VERTICAL: int = 1
@@ -33,20 +36,192 @@ def parse_input(lines: Sequence[InputLine]) -> Tuple[int, int, str]:
     return width, height, "".join(lines)
 
 
+#: Slope as steps to the right and down
+Slope = Tuple[int, int]
+
+
 @require(lambda width, height: width > 0 and height > 0)
 @require(lambda input_string: re.match(r"^[.#]*", input_string))
 @require(lambda width, height, input_string: width * height == len(input_string))
 @ensure(lambda result, height: result <= height / STEP_SIZE_VERTICAL)
 def count_trees(width: int, height: int, input_string: str) -> int:
     """Count the trees in the ``input_string``."""
-    count: int = 0
-    current_x: int = 0
-    current_y: int = 0
+    return count_trees_on_slopes(
+        width, height, input_string, [(STEP_SIZE_HORIZONTAL, STEP_SIZE_VERTICAL)]
+    )[0]
+
+
+@require(lambda slopes: all(right >= 0 and down > 0 for right, down in slopes))
+@require(lambda width, height: width > 0 and height > 0)
+@require(lambda input_string: re.match(r"^[.#]*", input_string))
+@require(lambda width, height, input_string: width * height == len(input_string))
+@ensure(lambda slopes, result: len(result) == len(slopes))
+# fmt: off
+@ensure(
+    lambda height, slopes, result:
+    all(
+        0 <= count <= (height + down - 1) // down
+        for count, (_, down) in zip(result, slopes)
+    )
+)
+# fmt: on
+def count_trees_on_slopes(
+    width: int, height: int, input_string: str, slopes: Sequence[Slope]
+) -> List[int]:
+    """
+    Count the trees in the ``input_string`` for each of the ``slopes``.
+
+    All the slopes are followed in a single pass over the rows of the map.
+    """
+    return _count_trees_in_rows(
+        data=input_string.encode("ascii"),
+        stride=width,
+        width=width,
+        start_row=0,
+        end_row=height,
+        slopes=slopes,
+    )
+
+
+#: Code of a tree in the encoded map
+TREE = ord("#")
+
+#: Number of rows visited by all the slopes before moving on to the next rows
+BLOCK_HEIGHT = 4096
+
+
+def _count_trees_in_rows(
+    data: Union[bytes, mmap.mmap],
+    stride: int,
+    width: int,
+    start_row: int,
+    end_row: int,
+    slopes: Sequence[Slope],
+) -> List[int]:
+    """
+    Count the trees for each of the ``slopes`` in the rows ``[start_row, end_row)``.
+
+    The row ``y`` starts at the byte ``y * stride`` of the ``data``. The column on
+    a row depends only on the row itself, so the rows can be counted independently.
+
+    The rows are processed in blocks of :py:data:`BLOCK_HEIGHT` so that all
+    the slopes visit a block while it is still in the cache (or in memory if
+    the data is memory-mapped), whereas each slope still runs in a tight loop.
+    """
+    result = [0] * len(slopes)
+
+    for block_start in range(start_row, end_row, BLOCK_HEIGHT):
+        block_end = min(block_start + BLOCK_HEIGHT, end_row)
+
+        for i, (right, down) in enumerate(slopes):
+            first_row = -(-block_start // down) * down
+            x = (first_row // down * right) % width
+            right %= width
+
+            count = 0
+            for row_offset in range(
+                first_row * stride, block_end * stride, down * stride
+            ):
+                if data[row_offset + x] == TREE:
+                    count += 1
+
+                x += right
+                if x >= width:
+                    x -= width
+
+            result[i] += count
+
+    return result
+
+
+@require(lambda path, start_row, end_row: 0 <= start_row <= end_row)
+def _count_trees_in_file_rows(
+    path: str, start_row: int, end_row: int, slopes: Sequence[Slope]
+) -> List[int]:
+    """Count the trees in the rows ``[start_row, end_row)`` of the map at ``path``."""
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        width = data.find(b"\n")
+        if width == -1:
+            width = len(data)
+
+        return _count_trees_in_rows(
+            data=data,
+            stride=width + 1,
+            width=width,
+            start_row=start_row,
+            end_row=end_row,
+            slopes=slopes,
+        )
+
+
+def _starts_with_new_line(path: str) -> bool:
+    """Check whether the file at ``path`` starts with a new-line character."""
+    with open(path, "rb") as file:
+        return file.read(1) == b"\n"
+
+
+def _read_lines(path: str) -> List[str]:
+    """Read the lines of the map in the file at ``path``."""
+    with open(path, "rt", encoding="ascii") as file:
+        return file.read().splitlines()
+
+
+@require(lambda slopes: all(right >= 0 and down > 0 for right, down in slopes))
+@require(lambda path: os.path.getsize(path) > 0)
+@require(lambda path: not _starts_with_new_line(path), "The first line is not empty")
+@require(lambda processes: processes >= 1)
+@ensure(lambda slopes, result: len(result) == len(slopes))
+# fmt: off
+@ensure(
+    lambda path, slopes, result:
+    (
+        lambda lines:
+        result == count_trees_on_slopes(
+            *parse_input([InputLine(line) for line in lines]), slopes
+        )
+    )(_read_lines(path)),
+    enabled=SLOW
+)
+# fmt: on
+def count_trees_in_file(
+    path: str, slopes: Sequence[Slope], processes: int = 1
+) -> List[int]:
+    """
+    Count the trees for each of the ``slopes`` on the map in the file at ``path``.
+
+    The file is memory-mapped and read directly from the disk, so very tall maps
+    need not fit into the memory. The lines are expected to have the same width
+    and to be separated by a single new-line character.
+
+    If ``processes`` is above 1, the rows are split into as many bands which are
+    counted in parallel.
+    """
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        width = data.find(b"\n")
+        if width == -1:
+            width = len(data)
+
+        # The last line might miss its new-line.
+        height = (len(data) + 1) // (width + 1)
+
+    if processes == 1:
+        return _count_trees_in_file_rows(path, 0, height, slopes)
+
+    bounds = [height * i // processes for i in range(processes + 1)]
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(_count_trees_in_file_rows, path, start, end, slopes)
+            for start, end in zip(bounds, bounds[1:])
+        ]
 
-    while current_y < height:
-        if input_string[current_y * width + current_x] == "#":
-            count += 1
-        current_x = (current_x + STEP_SIZE_HORIZONTAL) % width
-        current_y += STEP_SIZE_VERTICAL
+        result = [0] * len(slopes)
+        for future in futures:
+            for i, count in enumerate(future.result()):
+                result[i] += count
 
-    return count
+    return result
@@ -1,6 +1,9 @@
+import concurrent.futures
+import mmap
+import os
 import sys
 import re
-from typing import List, Tuple
+from typing import List, Tuple, Iterable, Iterator, Mapping, Pattern
 
 from icontract import require, ensure
 
@@ -36,8 +39,7 @@ def parse_passport_entries(text: str) -> List[Tuple[str, str]]:
 @ensure(lambda entry, result: result == all(k in dict(entry) for k in _REQUIRED_KEYS))
 def is_valid(entry: List[Tuple[str, str]]) -> bool:
     """Verify whether the passport entry is valid."""
-    entry_keys = dict(entry).keys()
-    return len(_REQUIRED_KEYS - entry_keys) == 0
+    return _REQUIRED_KEYS.issubset(key for key, _ in entry)
 
 
 @require(lambda batch: all(PASSPORT_RE.match(line) for line in blank_line_split(batch)))
@@ -51,6 +53,215 @@ def count_valid(batch: str) -> int:
     )
 
 
+#: Patterns of the values of the required fields according to the strict rules
+FIELD_RES = {
+    "byr": re.compile(r"19[2-9][0-9]|200[0-2]"),
+    "iyr": re.compile(r"201[0-9]|2020"),
+    "eyr": re.compile(r"202[0-9]|2030"),
+    "hgt": re.compile(r"(1[5-8][0-9]|19[0-3])cm|(59|6[0-9]|7[0-6])in"),
+    "hcl": re.compile(r"#[0-9a-f]{6}"),
+    "ecl": re.compile(r"amb|blu|brn|gry|grn|hzl|oth"),
+    "pid": re.compile(r"[0-9]{9}"),
+}  # type: Mapping[str, Pattern[str]]
+
+assert set(FIELD_RES.keys()) == _REQUIRED_KEYS
+
+
+# fmt: off
+@ensure(
+    lambda key, value, result:
+    not (key == "byr" and result) or 1920 <= int(value) <= 2002
+)
+@ensure(
+    lambda key, value, result:
+    not (key == "hgt" and result)
+    or (value.endswith("cm") and 150 <= int(value[:-2]) <= 193)
+    or (value.endswith("in") and 59 <= int(value[:-2]) <= 76)
+)
+@ensure(
+    lambda key, result:
+    not (key not in FIELD_RES) or result,
+    "Optional fields are always valid"
+)
+# fmt: on
+def is_field_valid(key: str, value: str) -> bool:
+    """Check the ``value`` of the field ``key`` against the strict rules."""
+    pattern = FIELD_RES.get(key, None)
+    return pattern is None or pattern.fullmatch(value) is not None
+
+
+# fmt: off
+@ensure(
+    lambda entry, result:
+    not result or is_valid(entry)
+)
+@ensure(
+    lambda entry, result:
+    not result
+    or all(is_field_valid(key, value) for key, value in entry)
+)
+# fmt: on
+def is_strictly_valid(entry: List[Tuple[str, str]]) -> bool:
+    """Verify that the passport ``entry`` has all the fields and their values valid."""
+    present = set()
+    for key, value in entry:
+        pattern = FIELD_RES.get(key, None)
+        if pattern is not None:
+            if pattern.fullmatch(value) is None:
+                return False
+            present.add(key)
+
+    return len(present) == len(FIELD_RES)
+
+
+ENTRY_RE = re.compile(r"(\w+):(\S+)")
+
+
+def iterate_passports(lines: Iterable[str]) -> Iterator[List[Tuple[str, str]]]:
+    """
+    Iterate lazily over the passport entries separated by blank ``lines``.
+
+    The lines are consumed one at a time so that an open file can be passed in
+    directly. Tokens which are not of the form ``key:value`` are ignored.
+    """
+    entry = []  # type: List[Tuple[str, str]]
+    for line in lines:
+        if line.strip():
+            entry.extend(ENTRY_RE.findall(line))
+        elif entry:
+            yield entry
+            entry = []
+
+    if entry:
+        yield entry
+
+
+@ensure(lambda result: result >= 0)
+def count_valid_in_stream(lines: Iterable[str], strict: bool = False) -> int:
+    """
+    Count the valid passports in the ``lines`` consumed incrementally.
+
+    :param lines: lines of the batch
+    :param strict: if set, check the values of the fields as well
+    :return: number of valid passports
+    """
+    check = is_strictly_valid if strict else is_valid
+    return sum(1 for entry in iterate_passports(lines) if check(entry))
+
+
+@require(lambda shard_count: shard_count >= 1)
+@ensure(lambda shard_count, result: 2 <= len(result) <= shard_count + 1)
+@ensure(lambda result: result[0] == 0)
+@ensure(lambda path, result: result[-1] == os.path.getsize(path))
+@ensure(
+    lambda result: result == [0, 0]
+    or all(start < end for start, end in zip(result, result[1:]))
+)
+def find_shard_boundaries(path: str, shard_count: int) -> List[int]:
+    """
+    Split the batch file at ``path`` into about ``shard_count`` shards.
+
+    Each boundary is placed just after a blank line so that no passport is split
+    across two shards.
+
+    :return: byte offsets of the boundaries, including the start and the end
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return [0, 0]
+
+    result = [0]
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        for i in range(1, shard_count):
+            # Step back a byte so that we do not miss a blank line at the offset.
+            offset = max(size * i // shard_count - 1, result[-1])
+
+            index = data.find(b"\n\n", offset)
+            if index == -1:
+                break
+
+            boundary = index + 2
+            if boundary < size:
+                result.append(boundary)
+
+    result.append(size)
+
+    return result
+
+
+#: Number of bytes read from a batch file at once
+CHUNK_SIZE = 1 << 20
+
+
+@require(lambda start, end: 0 <= start <= end)
+@require(lambda chunk_size: chunk_size >= 1)
+def read_lines(
+    path: str, start: int, end: int, chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Read lazily the lines of the file at ``path`` between the byte offsets.
+
+    The file is read in chunks of ``chunk_size`` bytes, which are decoded as
+    a whole, so that the memory stays bounded regardless of the file size.
+    """
+    with open(path, "rb") as file:
+        file.seek(start)
+
+        remaining = end - start
+        rest = b""
+        while remaining > 0:
+            chunk = file.read(min(chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+
+            last_newline = chunk.rfind(b"\n")
+            if last_newline == -1:
+                rest += chunk
+                continue
+
+            lines = (rest + chunk[: last_newline + 1]).decode("utf-8").split("\n")
+            rest = chunk[last_newline + 1 :]
+
+            # The last element is always empty as the text ends with a new-line.
+            yield from lines[:-1]
+
+        if rest:
+            yield rest.decode("utf-8")
+
+
+@require(lambda start, end: 0 <= start <= end)
+@ensure(lambda result: result >= 0)
+def count_valid_in_shard(path: str, start: int, end: int, strict: bool) -> int:
+    """Count the valid passports in the shard of the file at ``path``."""
+    return count_valid_in_stream(read_lines(path, start, end), strict=strict)
+
+
+@require(lambda processes: processes >= 1)
+@ensure(lambda result: result >= 0)
+def count_valid_in_file(path: str, strict: bool = False, processes: int = 1) -> int:
+    """
+    Count the valid passports in the batch file at ``path``.
+
+    The file is streamed rather than loaded. If ``processes`` is above 1, the file
+    is split on blank lines into as many shards which are counted in parallel.
+    """
+    if processes == 1:
+        return count_valid_in_shard(path, 0, os.path.getsize(path), strict)
+
+    boundaries = find_shard_boundaries(path, processes)
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(count_valid_in_shard, path, start, end, strict)
+            for start, end in zip(boundaries, boundaries[1:])
+        ]
+
+        return sum(future.result() for future in futures)
+
+
 if __name__ == "__main__":
     data = "".join(sys.stdin.readlines())
     print(count_valid(data))
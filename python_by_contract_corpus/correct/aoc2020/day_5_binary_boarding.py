@@ -1,5 +1,5 @@
 import re
-from typing import Tuple
+from typing import Tuple, List, Optional, Sequence
 
 from icontract import require, ensure
 
@@ -109,3 +109,69 @@ def determine_row_and_column(identifier: str) -> Tuple[int, int]:
 def determine_id(row: int, column: int) -> int:
     """Compute the identifier of the seat given its ``row`` and ``column``."""
     return row * 8 + column
+
+
+#: Translation of the directives of a boarding pass to binary digits
+SEAT_TRANSLATION = str.maketrans("FBLR", "0101")
+
+#: Number of all the possible seat IDs
+SEAT_COUNT = 128 * 8
+
+
+@require(lambda identifier: re.match(r"^[FB]{7}[LR]{3}\Z", identifier))
+# fmt: off
+@ensure(lambda result: 0 <= result < SEAT_COUNT)
+@ensure(
+    lambda identifier, result:
+    result == determine_id(*determine_row_and_column(identifier=identifier))
+)
+# fmt: on
+def decode_seat_id(identifier: str) -> int:
+    """Compute the seat ID of the ``identifier`` read directly as a binary number."""
+    return int(identifier.translate(SEAT_TRANSLATION), 2)
+
+
+# fmt: off
+@require(
+    lambda text:
+    all(re.match(r"^[FB]{7}[LR]{3}\Z", line) for line in text.split())
+)
+@ensure(
+    lambda text, result:
+    result == [decode_seat_id(identifier) for identifier in text.split()]
+)
+# fmt: on
+def decode_seat_ids(text: str) -> List[int]:
+    """
+    Decode all the boarding passes given as whitespace-separated ``text`` at once.
+
+    The whole text is translated in a single call, and only the conversion to
+    integers is done per boarding pass.
+    """
+    return [int(digits, 2) for digits in text.translate(SEAT_TRANSLATION).split()]
+
+
+# fmt: off
+@require(lambda seat_ids: all(0 <= seat_id < SEAT_COUNT for seat_id in seat_ids))
+@ensure(
+    lambda seat_ids, result:
+    not (result is not None)
+    or (
+        result not in seat_ids
+        and result - 1 in seat_ids
+        and result + 1 in seat_ids
+    )
+)
+# fmt: on
+def find_missing_seat(seat_ids: Sequence[int]) -> Optional[int]:
+    """
+    Find the first seat missing in ``seat_ids`` whose both neighbours are present.
+
+    :return: The missing seat ID, or None if there is none
+    """
+    bitmap = bytearray(SEAT_COUNT)
+    for seat_id in seat_ids:
+        bitmap[seat_id] = 1
+
+    index = bitmap.find(b"\x01\x00\x01")
+    return None if index == -1 else index + 1
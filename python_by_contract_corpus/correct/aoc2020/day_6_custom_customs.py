@@ -1,6 +1,81 @@
 from icontract import ensure, require
 import re
-from typing import Set
+from typing import Iterable, Iterator, Mapping, Tuple
+
+#: Bit of each question in the 26-bit mask of answers
+LETTER_TO_BIT = {
+    chr(ord("a") + i): 1 << i for i in range(26)
+}  # type: Mapping[str, int]
+
+#: Mask with all the 26 questions answered
+ALL_QUESTIONS = (1 << 26) - 1
+
+
+@require(lambda mask: mask >= 0)
+@ensure(lambda result: result >= 0)
+def popcount(mask: int) -> int:
+    """Count the set bits in the ``mask``."""
+    return bin(mask).count("1")
+
+
+@require(lambda line: re.fullmatch(r"[a-z]*", line))
+@ensure(lambda line, result: popcount(result) == len(set(line)))
+def answer_mask(line: str) -> int:
+    """Map the yes answers of a single person given as ``line`` to a 26-bit mask."""
+    mask = 0
+    for letter in line:
+        mask |= LETTER_TO_BIT[letter]
+    return mask
+
+
+def iterate_group_masks(lines: Iterable[str]) -> Iterator[Tuple[int, int]]:
+    """
+    Iterate over the groups in ``lines`` separated by empty lines.
+
+    The lines are consumed lazily and the trailing new-lines are ignored so that
+    an open file can be passed in directly.
+
+    :return: mask of the questions answered by anyone and by everyone, per group
+    """
+    union = 0
+    intersection = ALL_QUESTIONS
+    empty = True
+
+    for line in lines:
+        line = line.rstrip("\n")
+        if line:
+            mask = answer_mask(line)
+            union |= mask
+            intersection &= mask
+            empty = False
+        elif not empty:
+            yield union, intersection
+
+            union = 0
+            intersection = ALL_QUESTIONS
+            empty = True
+
+    if not empty:
+        yield union, intersection
+
+
+@ensure(lambda result: result[0] >= result[1] >= 0)
+def count_answers(lines: Iterable[str]) -> Tuple[int, int]:
+    """
+    Count the yes answers over all the groups given as ``lines`` in constant memory.
+
+    :return:
+        sum of the questions answered by anyone and sum of the questions answered
+        by everyone in the group
+    """
+    anyone = 0
+    everyone = 0
+    for union, intersection in iterate_group_masks(lines):
+        anyone += popcount(union)
+        everyone += popcount(intersection)
+
+    return anyone, everyone
+
 
 # fmt: off
 @require(
@@ -19,13 +94,22 @@ from typing import Set
 # fmt: on
 def solve(input_string: str) -> int:
     """Count the number of yes answers in the group given as ``input_string``."""
-    count = 0
-    yes_answers: Set[str] = set()
-    for line in input_string.split("\n"):
-        if line:
-            yes_answers = yes_answers.union(list(line))
-        else:
-            count += len(yes_answers)
-            yes_answers.clear()
-    count += len(yes_answers)
-    return count
+    return count_answers(input_string.split("\n"))[0]
+
+
+# fmt: off
+@require(
+    lambda input_string: all(
+        re.match(r"^[a-z]*$", line)
+        for line in input_string.split("\n")
+    )
+)
+@ensure(
+    lambda input_string, result:
+    0 <= result <= count_answers(input_string.split("\n"))[0],
+    "Everyone answered at most the questions that anyone answered"
+)
+# fmt: on
+def solve_everyone(input_string: str) -> int:
+    """Count the questions answered yes by everyone in a group of ``input_string``."""
+    return count_answers(input_string.split("\n"))[1]
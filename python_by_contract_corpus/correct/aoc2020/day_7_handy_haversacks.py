@@ -1,34 +1,70 @@
+import collections
 import re
 import sys
 from collections import defaultdict
-from typing import Dict, Set, Tuple
+from typing import (
+    AnyStr,
+    cast,
+    Dict,
+    Set,
+    Tuple,
+    Final,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Deque,
+    Pattern,
+    Union,
+)
+
+from icontract import require, ensure, DBC, SLOW
+
+from python_by_contract_corpus.common import Lines, MappedLines
+
+
+BAGEXPR_RE = re.compile(r"(?P<count>\d+) (?P<kind>.*) bags?")
+
+#: Expression of a bag as it appears in the contents of a rule, up to its delimiter
+SUBBAG_RE = re.compile(r"(?P<count>\d+) (?P<kind>[^,\r\n]+?) bags?(?=, |\.\r?$)")
+
+#: Rule on a single line, optionally followed by a carriage return
+RULE_RE = re.compile(
+    r"^(?P<kind>[^\r\n]+?) bags contain "
+    r"(?P<contents>no other bags|"
+    r"\d+ [^,\r\n]+? bags?(?:, \d+ [^,\r\n]+? bags?)*)\.\r?$",
+    re.MULTILINE,
+)
 
-from icontract import require, ensure
+#: Pattern of :py:data:`SUBBAG_RE` to be run on the encoded text
+SUBBAG_BYTES_RE = re.compile(SUBBAG_RE.pattern.encode("ascii"))
 
-from python_by_contract_corpus.common import Lines
+#: Pattern of :py:data:`RULE_RE` to be run on the encoded text
+RULE_BYTES_RE = re.compile(RULE_RE.pattern.encode("ascii"), re.MULTILINE)
 
 
-@require(lambda text: re.fullmatch(r"\d+ .* bags?", text))
+@require(lambda text: BAGEXPR_RE.fullmatch(text))
 def parse_bagexpr(text: str) -> Tuple[int, str]:
     """
     Parse the expression representing a bag.
 
     :return: number of units, kind
     """
-    match = re.fullmatch(r"(\d+) (.*) bags?", text)
+    match = BAGEXPR_RE.fullmatch(text)
     assert match
-    num, kind = match.groups()
-    return int(num), kind
+    return int(match.group("count")), match.group("kind")
 
 
-@require(lambda text: "\n" not in text)
-def parse_rule(text: str) -> Tuple[str, Dict[str, int]]:
+@require(lambda line: RULE_RE.fullmatch(line))
+def _parse_rule_by_splitting(line: str) -> Tuple[str, Dict[str, int]]:
     """
-    Parse the rule from the text given as a single line.
+    Parse the rule given as a single ``line`` by splitting it on the delimiters.
+
+    This is a reference implementation independent of :py:data:`SUBBAG_RE`.
 
     :return: kind, contents
     """
-    kind, contents_text = text.split(" bags contain ")
+    kind, contents_text = line.rstrip("\r").split(" bags contain ", 1)
     contents: Dict[str, int] = defaultdict(int)
     if contents_text != "no other bags.":
         for subbag_text in contents_text[:-1].split(", "):
@@ -37,6 +73,27 @@ def parse_rule(text: str) -> Tuple[str, Dict[str, int]]:
     return kind, contents
 
 
+@require(lambda text: RULE_RE.fullmatch(text))
+@ensure(
+    lambda text, result: result == _parse_rule_by_splitting(text),
+    "Same rule as parsed by splitting",
+    enabled=SLOW,
+)
+def parse_rule(text: str) -> Tuple[str, Dict[str, int]]:
+    """
+    Parse the rule from the text given as a single line.
+
+    :return: kind, contents
+    """
+    match = RULE_RE.fullmatch(text)
+    assert match
+
+    contents: Dict[str, int] = defaultdict(int)
+    for subbag in SUBBAG_RE.finditer(text, match.start("contents"), match.end()):
+        contents[subbag.group("kind")] += int(subbag.group("count"))
+    return match.group("kind"), contents
+
+
 Rules = Dict[str, Dict[str, int]]
 
 
@@ -54,6 +111,117 @@ def directly_contains(container: str, contained: str, rules: Rules) -> bool:
     return rules.get(container, {}).get(contained, 0) > 0
 
 
+class RuleGraph(DBC):
+    """
+    Represent the rules as a graph over the kinds interned as integers.
+
+    Only the contents with a positive count are represented as edges.
+    """
+
+    kinds: Final[List[str]]  #: Kind of each node
+    kind_ids: Final[Mapping[str, int]]  #: Node of each kind
+
+    #: Contained kinds and their counts for each node
+    contents: Final[List[List[Tuple[int, int]]]]
+
+    #: Nodes directly containing each node
+    containers: Final[List[List[int]]]
+
+    @require(lambda kinds, kind_ids: len(kinds) == len(kind_ids))
+    @require(
+        lambda kinds, kind_ids: all(
+            kind_ids[kind] == kind_id for kind_id, kind in enumerate(kinds)
+        )
+    )
+    @require(
+        lambda kinds, contents, containers: len(kinds) == len(contents)
+        and len(kinds) == len(containers)
+    )
+    def __init__(
+        self,
+        kinds: List[str],
+        kind_ids: Mapping[str, int],
+        contents: List[List[Tuple[int, int]]],
+        containers: List[List[int]],
+    ) -> None:
+        """Initialize with the given values."""
+        self.kinds = kinds
+        self.kind_ids = kind_ids
+        self.contents = contents
+        self.containers = containers
+
+
+def _intern(
+    kind: str,
+    kind_ids: MutableMapping[str, int],
+    kinds: List[str],
+    contents: List[List[Tuple[int, int]]],
+    containers: List[List[int]],
+) -> int:
+    """Return the node of the ``kind``, and add a new one if necessary."""
+    kind_id = kind_ids.get(kind, None)
+    if kind_id is None:
+        kind_id = len(kinds)
+        kind_ids[kind] = kind_id
+        kinds.append(kind)
+        contents.append([])
+        containers.append([])
+
+    return kind_id
+
+
+# fmt: off
+@ensure(
+    lambda rules, result:
+    all(kind in result.kind_ids for kind in rules)
+)
+@ensure(
+    lambda rules, result:
+    all(
+        directly_contains(result.kinds[container], result.kinds[contained], rules)
+        for container, edges in enumerate(result.contents)
+        for contained, _ in edges
+    )
+)
+# fmt: on
+def intern_rules(rules: Rules) -> RuleGraph:
+    """Intern the kinds of the ``rules`` and build the graph with reverse edges."""
+    kinds = []  # type: List[str]
+    kind_ids = dict()  # type: MutableMapping[str, int]
+    contents = []  # type: List[List[Tuple[int, int]]]
+    containers = []  # type: List[List[int]]
+
+    for kind, subbags in rules.items():
+        kind_id = _intern(kind, kind_ids, kinds, contents, containers)
+
+        for subkind, count in subbags.items():
+            if count > 0:
+                subkind_id = _intern(subkind, kind_ids, kinds, contents, containers)
+                contents[kind_id].append((subkind_id, count))
+                containers[subkind_id].append(kind_id)
+
+    return RuleGraph(
+        kinds=kinds, kind_ids=kind_ids, contents=contents, containers=containers
+    )
+
+
+@require(lambda graph, kind_id: 0 <= kind_id < len(graph.kinds))
+@ensure(lambda kind_id, result: kind_id in result)
+def find_containers(graph: RuleGraph, kind_id: int) -> Set[int]:
+    """Find all the nodes which transitively contain ``kind_id`` (including itself)."""
+    result = {kind_id}
+
+    queue = collections.deque([kind_id])  # type: Deque[int]
+    while queue:
+        node = queue.popleft()
+        for container in graph.containers[node]:
+            if container not in result:
+                result.add(container)
+                queue.append(container)
+
+    return result
+
+
 # fmt: off
 @ensure(
     lambda kind, result: kind in result,
@@ -62,24 +230,224 @@ def directly_contains(container: str, contained: str, rules: Rules) -> bool:
 @ensure(
     lambda kind, rules, result:
     all(
-        not directly_contains(non_container, container, rules)
-        for non_container in (rules.keys() - result)
-        for container in result
+        container in result
+        for container, subbags in rules.items()
+        for contained, count in subbags.items()
+        if count > 0 and contained in result
     ),
     "Nothing else contains anything in the result",
 )
 # fmt: on
 def containers(kind: str, rules: Rules) -> Set[str]:
     """Compute the set of known containers."""
-    known_containers: Set[str] = {kind}
-    last_size = 0
-    while last_size < len(known_containers):
-        last_size = len(known_containers)
-        for container_kind, subbags in rules.items():
-            for (contents_kind, _ct) in subbags.items():
-                if contents_kind in known_containers:
-                    known_containers.add(container_kind)
-    return known_containers
+    graph = intern_rules(rules)
+
+    kind_id = graph.kind_ids.get(kind, None)
+    if kind_id is None:
+        return {kind}
+
+    return {graph.kinds[node] for node in find_containers(graph, kind_id)}
+
+
+@require(lambda graph, kind_id: 0 <= kind_id < len(graph.kinds))
+@ensure(lambda result: result is None or result >= 0)
+def count_contained_bags(graph: RuleGraph, kind_id: int) -> Optional[int]:
+    """
+    Count the bags required inside a bag of the kind ``kind_id``.
+
+    The totals are memoised per node, and the graph is traversed with an explicit
+    stack so that deep chains of rules do not exhaust the call stack.
+
+    :return: the number of bags, or None if the kind transitively contains itself
+    """
+    totals = [None] * len(graph.kinds)  # type: List[Optional[int]]
+    on_stack = bytearray(len(graph.kinds))
+
+    # Each frame holds a node and the index of its next edge to visit.
+    stack = [(kind_id, 0)]
+    on_stack[kind_id] = 1
+
+    while stack:
+        node, edge_index = stack[-1]
+        edges = graph.contents[node]
+
+        while edge_index < len(edges) and totals[edges[edge_index][0]] is not None:
+            edge_index += 1
+
+        if edge_index < len(edges):
+            subkind_id = edges[edge_index][0]
+            if on_stack[subkind_id]:
+                return None
+
+            stack[-1] = (node, edge_index)
+            stack.append((subkind_id, 0))
+            on_stack[subkind_id] = 1
+            continue
+
+        total = 0
+        for subkind_id, count in edges:
+            subtotal = totals[subkind_id]
+            assert subtotal is not None
+            total += count * (1 + subtotal)
+
+        totals[node] = total
+        on_stack[node] = 0
+        stack.pop()
+
+    return totals[kind_id]
+
+
+def graph_to_rules(graph: RuleGraph) -> Rules:
+    """Convert the ``graph`` back to the rules, summing the counts of parallel edges."""
+    rules: Rules = {}
+    for kind, edges in zip(graph.kinds, graph.contents):
+        contents: Dict[str, int] = defaultdict(int)
+        for subkind_id, count in edges:
+            contents[graph.kinds[subkind_id]] += count
+        rules[kind] = dict(contents)
+    return rules
+
+
+def _split_rule_lines(text: str) -> List[str]:
+    """Split the ``text`` on the line feeds the same way as :py:data:`RULE_RE` does."""
+    lines = text.split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    return lines
+
+
+def _defines_kinds_once(lines: List[str]) -> bool:
+    """Check that no kind is defined in more than one of the rule ``lines``."""
+    kinds = [line.split(" bags contain ")[0] for line in lines]
+    return len(kinds) == len(set(kinds))
+
+
+def _scan_rules(
+    text: AnyStr,
+    rule_re: Pattern[AnyStr],
+    subbag_re: Pattern[AnyStr],
+) -> Tuple[
+    List[AnyStr],
+    MutableMapping[AnyStr, int],
+    List[List[Tuple[int, int]]],
+    List[List[int]],
+]:
+    """
+    Run a single pass of ``rule_re`` over the ``text`` and intern the kinds.
+
+    The contents of each rule are matched with ``subbag_re`` in place without
+    slicing or splitting the lines.
+
+    :return: kinds, kind IDs, contained kinds with counts and containers of each node
+    """
+    kinds = []  # type: List[AnyStr]
+    kind_ids = dict()  # type: MutableMapping[AnyStr, int]
+    contents = []  # type: List[List[Tuple[int, int]]]
+    containers = []  # type: List[List[int]]
+
+    # The interning is inlined as it dominates the run time on large inputs.
+    subbag_finditer = subbag_re.finditer
+    setdefault = kind_ids.setdefault
+
+    for rule in rule_re.finditer(text):
+        kind_id = setdefault(rule.group("kind"), len(kinds))
+        if kind_id == len(kinds):
+            kinds.append(rule.group("kind"))
+            contents.append([])
+            containers.append([])
+
+        edges = contents[kind_id]
+
+        for subbag in subbag_finditer(text, rule.start("contents"), rule.end()):
+            count = int(subbag.group("count"))
+            if count > 0:
+                subkind = subbag.group("kind")
+                subkind_id = setdefault(subkind, len(kinds))
+                if subkind_id == len(kinds):
+                    kinds.append(subkind)
+                    contents.append([])
+                    containers.append([])
+
+                edges.append((subkind_id, count))
+                containers[subkind_id].append(kind_id)
+
+    return kinds, kind_ids, contents, containers
+
+
+# fmt: off
+@require(
+    lambda text:
+    all(RULE_RE.fullmatch(line) for line in _split_rule_lines(text))
+)
+@require(
+    lambda text: _defines_kinds_once(_split_rule_lines(text)),
+    "Each kind is defined at most once"
+)
+@ensure(
+    lambda text, result:
+    (
+        lambda graph_rules, parsed_rules:
+        all(
+            graph_rules.get(kind, {}) == {
+                subkind: count for subkind, count in contents.items() if count > 0
+            }
+            for kind, contents in parsed_rules.items()
+        )
+        and all(
+            kind in parsed_rules or len(contents) == 0
+            for kind, contents in graph_rules.items()
+        )
+    )(
+        graph_to_rules(result),
+        dict(_parse_rule_by_splitting(line) for line in _split_rule_lines(text))
+    ),
+    "Same rules as parsed line by line by splitting",
+    enabled=SLOW
+)
+# fmt: on
+def load_graph(text: str) -> RuleGraph:
+    r"""
+    Parse the rules given as the whole ``text`` directly into a rule graph.
+
+    We run a single pass of :py:data:`RULE_RE` over the text, and match the
+    contents of each rule in place without slicing or splitting the lines.
+    The lines can be separated either by ``\n`` or ``\r\n``.
+    """
+    kinds, kind_ids, contents, containers = _scan_rules(text, RULE_RE, SUBBAG_RE)
+
+    return RuleGraph(
+        kinds=kinds, kind_ids=kind_ids, contents=contents, containers=containers
+    )
+
+
+# fmt: off
+@ensure(
+    lambda data, result:
+    graph_to_rules(result) == graph_to_rules(load_graph(str(data, "utf-8"))),
+    "Same graph as loaded from the decoded text",
+    enabled=SLOW
+)
+# fmt: on
+def load_graph_from_bytes(data: Union[bytes, memoryview]) -> RuleGraph:
+    """
+    Parse the rules given as UTF-8 encoded ``data`` directly into a rule graph.
+
+    The ``data`` needs to satisfy the same conditions as the text of
+    :py:func:`load_graph`. The patterns run on the bytes in place so that the
+    ``data`` can be a view on a memory-mapped file, and only the kinds are
+    decoded.
+    """
+    # The patterns accept any buffer, while the type of the text is bound to them.
+    raw_kinds, _, contents, containers = _scan_rules(
+        cast(bytes, data), RULE_BYTES_RE, SUBBAG_BYTES_RE
+    )
+
+    kinds = [raw_kind.decode("utf-8") for raw_kind in raw_kinds]
+    kind_ids = {kind: kind_id for kind_id, kind in enumerate(kinds)}
+
+    return RuleGraph(
+        kinds=kinds, kind_ids=kind_ids, contents=contents, containers=containers
+    )
 
 
 def count_containers(lines: Lines) -> int:
@@ -90,10 +458,33 @@ def count_containers(lines: Lines) -> int:
     return len(allowed_containers) - 1
 
 
+def count_required_bags(lines: Lines) -> Optional[int]:
+    """Parse the rules given as ``lines`` and count the bags inside a shiny gold one."""
+    graph = intern_rules(parse_rules(lines))
+
+    kind_id = graph.kind_ids.get("shiny gold", None)
+    if kind_id is None:
+        return 0
+
+    return count_contained_bags(graph, kind_id)
+
+
 def main() -> None:
-    """Execute the main routine."""
-    lines = Lines(sys.stdin.read().splitlines())
-    print(count_containers(lines))
+    """
+    Execute the main routine.
+
+    The input is read from the file given as the first argument, if any, and
+    from the standard input otherwise.
+    """
+    if len(sys.argv) > 1:
+        with MappedLines(sys.argv[1]) as lines:
+            with lines.block(0, len(lines)) as block:
+                graph = load_graph_from_bytes(block)
+    else:
+        graph = load_graph(sys.stdin.read())
+
+    kind_id = graph.kind_ids.get("shiny gold", None)
+    print(0 if kind_id is None else len(find_containers(graph, kind_id)) - 1)
 
 
 if __name__ == "__main__":
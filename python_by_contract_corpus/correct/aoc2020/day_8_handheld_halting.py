@@ -1,9 +1,11 @@
+import array
+import collections
 import dataclasses
 import enum
 import re
-from typing import Mapping, List, Optional, Set
+from typing import Mapping, List, Optional, Set, Final, Sequence, Tuple, Deque
 
-from icontract import require, ensure
+from icontract import require, ensure, DBC, SLOW
 
 # crosshair: on
 from python_by_contract_corpus.common import Lines
@@ -96,3 +98,230 @@ def execute_instructions(instructions: List[Instruction]) -> Optional[int]:
             current_line += instruction.argument
         else:
             raise NotImplementedError(instruction.operation)
+
+
+#: Opcode of :py:attr:`Operation.NOP` in a compiled program
+OPCODE_NOP = 0
+
+#: Opcode of :py:attr:`Operation.ACC` in a compiled program
+OPCODE_ACC = 1
+
+#: Opcode of :py:attr:`Operation.JMP` in a compiled program
+OPCODE_JMP = 2
+
+OPERATION_TO_OPCODE = {
+    Operation.NOP: OPCODE_NOP,
+    Operation.ACC: OPCODE_ACC,
+    Operation.JMP: OPCODE_JMP,
+}  # type: Mapping[Operation, int]
+
+#: Arguments of a compiled program need to fit into a signed 64-bit integer
+ARGUMENT_BOUND = 1 << 63
+
+#: Opcode after swapping ``nop`` and ``jmp``, indexed by the original opcode
+FLIPPED_OPCODE = (OPCODE_JMP, OPCODE_ACC, OPCODE_NOP)
+
+
+class CompiledProgram(DBC):
+    """Represent the boot code as parallel arrays of opcodes and arguments."""
+
+    opcodes: Final[bytes]  #: Opcode of each line
+    arguments: Final[Sequence[int]]  #: Argument of each line
+
+    @require(lambda opcodes, arguments: len(opcodes) == len(arguments))
+    @require(lambda opcodes: all(opcode in FLIPPED_OPCODE for opcode in opcodes))
+    # fmt: off
+    @require(
+        lambda opcodes, arguments:
+        all(
+            0 <= i + argument <= len(opcodes)
+            for i, (opcode, argument) in enumerate(zip(opcodes, arguments))
+            if opcode == OPCODE_JMP
+        )
+    )
+    # fmt: on
+    def __init__(self, opcodes: bytes, arguments: Sequence[int]) -> None:
+        """Initialize with the given values."""
+        self.opcodes = opcodes
+        self.arguments = arguments
+
+    def __len__(self) -> int:
+        """Return the number of the lines."""
+        return len(self.opcodes)
+
+
+@require(
+    lambda instructions: all(
+        0 <= i + instruction.argument <= len(instructions)
+        for i, instruction in enumerate(instructions)
+        if instruction.operation == Operation.JMP
+    )
+)
+@require(
+    lambda instructions: all(
+        -ARGUMENT_BOUND <= instruction.argument < ARGUMENT_BOUND
+        for instruction in instructions
+    )
+)
+@ensure(lambda instructions, result: len(result) == len(instructions))
+def compile_instructions(instructions: List[Instruction]) -> CompiledProgram:
+    """Compile the ``instructions`` into the parallel arrays of a program."""
+    return CompiledProgram(
+        opcodes=bytes(
+            OPERATION_TO_OPCODE[instruction.operation] for instruction in instructions
+        ),
+        arguments=array.array(
+            "q", (instruction.argument for instruction in instructions)
+        ),
+    )
+
+
+@require(
+    lambda program, flipped_line: flipped_line is None
+    or 0 <= flipped_line < len(program)
+)
+def _run(program: CompiledProgram, flipped_line: Optional[int]) -> Tuple[bool, int]:
+    """
+    Run the ``program`` with the ``flipped_line`` swapped between ``nop`` and ``jmp``.
+
+    :return:
+        Whether the program terminated, and the accumulator at termination or
+        just before an instruction is run for the second time
+    """
+    opcodes = program.opcodes
+    arguments = program.arguments
+    end = len(opcodes)
+
+    visited = bytearray(end)
+
+    current_line = 0
+    accumulator = 0
+
+    while 0 <= current_line < end and not visited[current_line]:
+        visited[current_line] = 1
+
+        opcode = opcodes[current_line]
+        if current_line == flipped_line:
+            opcode = FLIPPED_OPCODE[opcode]
+
+        if opcode == OPCODE_JMP:
+            current_line += arguments[current_line]
+        else:
+            if opcode == OPCODE_ACC:
+                accumulator += arguments[current_line]
+            current_line += 1
+
+    return current_line == end, accumulator
+
+
+def execute_compiled(program: CompiledProgram) -> Optional[int]:
+    """
+    Execute the compiled boot ``program``.
+
+    :return:
+        The value in the accumulator just before an instruction is run
+        for the second time, or None if the program terminates
+    """
+    terminated, accumulator = _run(program=program, flipped_line=None)
+    return None if terminated else accumulator
+
+
+# fmt: off
+@ensure(
+    lambda program, result:
+    result is None
+    or (
+        program.opcodes[result] != OPCODE_ACC
+        and _run(program=program, flipped_line=result)[0]
+    )
+)
+@ensure(
+    lambda program, result:
+    not (result is None)
+    or _run(program=program, flipped_line=None)[0]
+    or not any(
+        _run(program=program, flipped_line=line)[0]
+        for line, opcode in enumerate(program.opcodes)
+        if opcode != OPCODE_ACC
+    ),
+    "No single flip terminates a looping program",
+    enabled=SLOW
+)
+# fmt: on
+def find_repair(program: CompiledProgram) -> Optional[int]:
+    """
+    Find the line whose swap between ``nop`` and ``jmp`` makes the program terminate.
+
+    Instead of re-running the program for every candidate, we first determine
+    all the lines from which the unmodified program terminates by walking
+    backwards from the end. The fix is then the first line on the looping path
+    whose swapped successor is one of these lines.
+
+    :return: The line to be flipped, or None if the program needs no or no such fix
+    """
+    opcodes = program.opcodes
+    arguments = program.arguments
+    end = len(opcodes)
+
+    predecessors = [[] for _ in range(end + 1)]  # type: List[List[int]]
+    for line, (opcode, argument) in enumerate(zip(opcodes, arguments)):
+        successor = line + argument if opcode == OPCODE_JMP else line + 1
+        predecessors[successor].append(line)
+
+    terminates = bytearray(end + 1)
+    terminates[end] = 1
+
+    queue = collections.deque([end])  # type: Deque[int]
+    while queue:
+        line = queue.popleft()
+        for predecessor in predecessors[line]:
+            if not terminates[predecessor]:
+                terminates[predecessor] = 1
+                queue.append(predecessor)
+
+    if terminates[0]:
+        return None
+
+    visited = bytearray(end)
+    current_line = 0
+
+    while not visited[current_line]:
+        visited[current_line] = 1
+
+        opcode = opcodes[current_line]
+        argument = arguments[current_line]
+
+        if opcode == OPCODE_JMP:
+            flipped_successor = current_line + 1
+        elif opcode == OPCODE_NOP:
+            flipped_successor = current_line + argument
+        else:
+            flipped_successor = -1
+
+        if 0 <= flipped_successor <= end and terminates[flipped_successor]:
+            return current_line
+
+        current_line = (
+            current_line + argument if opcode == OPCODE_JMP else current_line + 1
+        )
+
+    return None
+
+
+def execute_repaired(program: CompiledProgram) -> Optional[int]:
+    """
+    Repair the ``program`` by swapping a single ``nop`` or ``jmp`` and execute it.
+
+    :return: The value in the accumulator after termination, or None if no repair
+    """
+    if execute_compiled(program=program) is None:
+        return _run(program=program, flipped_line=None)[1]
+
+    flipped_line = find_repair(program=program)
+    if flipped_line is None:
+        return None
+
+    terminated, accumulator = _run(program=program, flipped_line=flipped_line)
+    assert terminated
+
+    return accumulator
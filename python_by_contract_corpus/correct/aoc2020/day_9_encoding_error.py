@@ -1,10 +1,12 @@
-from typing import List, Tuple, Optional
+import collections
+from typing import List, Tuple, Optional, Iterable, Deque, MutableMapping
 from icontract import ensure, require
 from itertools import combinations
 
 # preamble_length = 5
 
 
+@require(lambda preamble_length: preamble_length >= 0)
 @require(lambda puzzle_input, preamble_length: len(puzzle_input) > preamble_length)
 @require(lambda puzzle_input: all(number >= 0 for number in puzzle_input))
 @ensure(lambda result, puzzle_input: not result or result[1] in puzzle_input)
@@ -24,14 +26,109 @@ def solve(puzzle_input: List[int], preamble_length: int) -> Optional[Tuple[int,
         offset of the number,
         first number *after* the preamble which uncovers the weakness
     """
-    for index, number in enumerate(puzzle_input[preamble_length:]):
-        preamble = puzzle_input[index : index + preamble_length]
-        valid = False
-        for i in preamble:
-            for j in preamble:
-                if i != j and i + j == number:
-                    valid = True
-        if not valid:
-            return preamble_length + index, number
+    return find_first_invalid(numbers=puzzle_input, preamble_length=preamble_length)
+
+
+@require(lambda preamble_length: preamble_length >= 0)
+@ensure(lambda preamble_length, result: not result or result[0] >= preamble_length)
+def find_first_invalid(
+    numbers: Iterable[int], preamble_length: int
+) -> Optional[Tuple[int, int]]:
+    """
+    Find the first number of the stream ``numbers`` which uncovers a weakness.
+
+    A number is valid if it is a sum of two different numbers in the window of
+    ``preamble_length`` numbers immediately preceding it. Only the window is kept
+    in memory so that arbitrary long streams can be validated.
+
+    :return:
+        offset of the number,
+        first number *after* the preamble which uncovers the weakness
+    """
+    window = collections.deque()  # type: Deque[int]
+
+    # Count the occurrences of the numbers in the window
+    counter = collections.Counter()  # type: MutableMapping[int, int]
+
+    for index, number in enumerate(numbers):
+        if index >= preamble_length:
+            valid = any(
+                number - other != other and number - other in counter
+                for other in counter
+            )
+            if not valid:
+                return index, number
+
+        window.append(number)
+        counter[number] += 1
+
+        if len(window) > preamble_length:
+            oldest = window.popleft()
+            counter[oldest] -= 1
+            if counter[oldest] == 0:
+                del counter[oldest]
 
     return None
+
+
+@require(lambda puzzle_input: all(number >= 0 for number in puzzle_input))
+# fmt: off
+@ensure(
+    lambda puzzle_input, target, result:
+    not result
+    or (
+        result[1] - result[0] >= 2
+        and sum(puzzle_input[result[0]:result[1]]) == target
+    )
+)
+# fmt: on
+def find_contiguous_range(
+    puzzle_input: List[int], target: int
+) -> Optional[Tuple[int, int]]:
+    """
+    Find a contiguous range of at least two numbers summing up to ``target``.
+
+    We keep the prefix sums of ``puzzle_input`` in a map so that every range
+    ending at a given position can be looked up in constant time.
+
+    :return: start and end (exclusive) of the range, if any
+    """
+    # Map prefix sum 🠒 the earliest position where it has been reached
+    starts = dict()  # type: MutableMapping[int, int]
+
+    prefix_sums = [0]  # type: List[int]
+    for number in puzzle_input:
+        prefix_sums.append(prefix_sums[-1] + number)
+
+    for end in range(2, len(prefix_sums)):
+        # The range needs to span at least two numbers.
+        starts.setdefault(prefix_sums[end - 2], end - 2)
+
+        start = starts.get(prefix_sums[end] - target)
+        if start is not None:
+            return start, end
+
+    return None
+
+
+@require(lambda puzzle_input: all(number >= 0 for number in puzzle_input))
+@ensure(lambda result: result is None or result >= 0)
+def find_encryption_weakness(
+    puzzle_input: List[int], invalid_number: int
+) -> Optional[int]:
+    """
+    Find the encryption weakness for the ``invalid_number``.
+
+    :return:
+        sum of the smallest and the largest number in the contiguous range
+        summing up to ``invalid_number``, if any
+    """
+    contiguous_range = find_contiguous_range(
+        puzzle_input=puzzle_input, target=invalid_number
+    )
+    if contiguous_range is None:
+        return None
+
+    start, end = contiguous_range
+    numbers = puzzle_input[start:end]
+    return min(numbers) + max(numbers)
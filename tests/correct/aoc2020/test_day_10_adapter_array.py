@@ -1,3 +1,4 @@
+import array
 import textwrap
 import unittest
 
@@ -12,6 +13,8 @@ class TestWithIcontractHypothesis(unittest.TestCase):
         for func in [
             day_10_adapter_array.histogram_differences,
             day_10_adapter_array.parse,
+            day_10_adapter_array.sort_adapters,
+            day_10_adapter_array.count_arrangements,
         ]:
             try:
                 icontract_hypothesis.test_with_inferred_strategy(func)  # type: ignore
@@ -52,6 +55,8 @@ class TestManually(unittest.TestCase):
 
         self.assertEqual(7 * 5, result)
 
+        self.assertEqual(8, day_10_adapter_array.count_arrangements(adapters))
+
     def test_example_long(self) -> None:
         lines = common.Lines(
             textwrap.dedent(
@@ -101,6 +106,29 @@ class TestManually(unittest.TestCase):
 
         self.assertEqual(22 * 10, result)
 
+        self.assertEqual(19208, day_10_adapter_array.count_arrangements(adapters))
+        self.assertEqual(
+            19208 % 1000,
+            day_10_adapter_array.count_arrangements(adapters, modulus=1000),
+        )
+
+    def test_array_input(self) -> None:
+        adapters = array.array("l", [16, 10, 15, 5, 1, 11, 7, 19, 6, 12, 4])
+
+        histo = day_10_adapter_array.histogram_differences(adapters)
+        self.assertEqual(7, histo[1])
+        self.assertEqual(5, histo[3])
+
+        self.assertEqual(8, day_10_adapter_array.count_arrangements(adapters))
+
+    def test_no_arrangement_over_a_gap(self) -> None:
+        self.assertEqual(0, day_10_adapter_array.count_arrangements([1, 2, 6]))
+
+    def test_sort_sparse_adapters(self) -> None:
+        self.assertListEqual(
+            [1, 1000, 5000], day_10_adapter_array.sort_adapters([5000, 1, 1000])
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
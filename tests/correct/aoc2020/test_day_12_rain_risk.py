@@ -12,6 +12,7 @@ class TestWithIcontractHypothesis(unittest.TestCase):
             day_12_rain_risk.parse_input,
             day_12_rain_risk.update_position,
             day_12_rain_risk.solve,
+            day_12_rain_risk.parse_commands,
         ]:
             try:
                 icontract_hypothesis.test_with_inferred_strategy(func)  # type: ignore
@@ -22,16 +23,19 @@ class TestWithIcontractHypothesis(unittest.TestCase):
                 ) from error
 
 
+EXAMPLE_INPUT = textwrap.dedent(
+    """\
+    F10
+    N3
+    F7
+    R90
+    F11"""
+)
+
+
 class TestManually(unittest.TestCase):
     def test_case(self) -> None:
-        example_input = textwrap.dedent(
-            """\
-            F10
-            N3
-            F7
-            R90
-            F11"""
-        )
+        example_input = EXAMPLE_INPUT
 
         self.assertEqual(
             day_12_rain_risk.ShipPosition(
@@ -42,6 +46,34 @@ class TestManually(unittest.TestCase):
             day_12_rain_risk.solve(example_input),
         )
 
+    def test_update_position_does_not_mutate(self) -> None:
+        position = day_12_rain_risk.ShipPosition(
+            horizontal=0, vertical=0, orientation=day_12_rain_risk.Orientation.EAST
+        )
+
+        next_position = day_12_rain_risk.update_position(position, "R270")
+
+        self.assertEqual(day_12_rain_risk.Orientation.EAST, position.orientation)
+        self.assertEqual(day_12_rain_risk.Orientation.NORTH, next_position.orientation)
+
+
+class TestNavigation(unittest.TestCase):
+    def test_navigate_ship(self) -> None:
+        commands = day_12_rain_risk.parse_commands(EXAMPLE_INPUT)
+
+        self.assertEqual((17, -8), day_12_rain_risk.navigate_ship(commands))
+
+    def test_navigate_waypoint(self) -> None:
+        commands = day_12_rain_risk.parse_commands(EXAMPLE_INPUT)
+
+        self.assertEqual((214, -72), day_12_rain_risk.navigate_waypoint(commands))
+
+    def test_rotations(self) -> None:
+        commands = day_12_rain_risk.parse_commands("L90\nF1\nR180\nF2\nL270\nF3")
+
+        self.assertEqual((-3, -1), day_12_rain_risk.navigate_ship(commands))
+        self.assertEqual((-1, -7), day_12_rain_risk.navigate_waypoint(commands, (1, 2)))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,6 +2,7 @@ import unittest
 
 import icontract_hypothesis
 
+from python_by_contract_corpus import common
 from python_by_contract_corpus.correct.aoc2020 import day_13_shuttle_search
 
 
@@ -10,6 +11,7 @@ class TestWithIcontractHypothesis(unittest.TestCase):
         for func in [
             day_13_shuttle_search.next_departure,
             day_13_shuttle_search.find_departure,
+            day_13_shuttle_search.find_aligned_departure,
             # NOTE: not testing this; it's too hard to match the regex
             # day_13_shuttle_search.parse_input
         ]:
@@ -28,6 +30,39 @@ class TestManually(unittest.TestCase):
             (944, 59), day_13_shuttle_search.find_departure(939, {7, 13, 59, 31, 19})
         )
 
+    def test_parse_input_with_offsets(self) -> None:
+        min_time, buses = day_13_shuttle_search.parse_input_with_offsets(
+            common.Lines(["939", "7,13,x,x,59,x,31,19"])
+        )
+
+        self.assertEqual(939, min_time)
+        self.assertListEqual([(7, 0), (13, 1), (59, 4), (31, 6), (19, 7)], buses)
+
+    def test_aligned_departure(self) -> None:
+        for text, expected in [
+            ("7,13,x,x,59,x,31,19", 1068781),
+            ("17,x,13,19", 3417),
+            ("67,7,59,61", 754018),
+            ("67,x,7,59,61", 779210),
+            ("67,7,x,59,61", 1261476),
+            ("1789,37,47,1889", 1202161486),
+        ]:
+            buses = day_13_shuttle_search.parse_bus_offsets(text)
+            self.assertEqual(
+                expected, day_13_shuttle_search.find_aligned_departure(buses), text
+            )
+
+    def test_aligned_departure_with_non_coprime_ids(self) -> None:
+        # t ≡ 0 (mod 4) and t ≡ 4 (mod 6)
+        self.assertEqual(
+            4, day_13_shuttle_search.find_aligned_departure([(4, 0), (6, 2)])
+        )
+
+        # t ≡ 0 (mod 4) and t ≡ 5 (mod 6) has no solution.
+        self.assertIsNone(
+            day_13_shuttle_search.find_aligned_departure([(4, 0), (6, 1)])
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
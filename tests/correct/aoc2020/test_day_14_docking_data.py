@@ -1,5 +1,6 @@
 import textwrap
 import unittest
+from typing import Dict
 
 import icontract_hypothesis
 
@@ -13,6 +14,8 @@ class TestWithIcontractHypothesis(unittest.TestCase):
             day_14_docking_data.parse_mask,
             day_14_docking_data.parse_write,
             day_14_docking_data.execute,
+            day_14_docking_data.floating_bits,
+            day_14_docking_data.subtract,
         ]:
             try:
                 icontract_hypothesis.test_with_inferred_strategy(func)  # type: ignore
@@ -42,6 +45,74 @@ class TestManually(unittest.TestCase):
 
         self.assertEqual(165, day_14_docking_data.sum_memory(memory=memory))
 
+    def test_multiple_masks(self) -> None:
+        lines = common.Lines(
+            textwrap.dedent(
+                """\
+                mask = XXXXXXXXXXXXXXXXXXXXXXXXXXXXX1XXXX0X
+                mem[8] = 11
+                mem[7] = 101
+                mask = XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX1
+                mem[8] = 0"""
+            ).splitlines()
+        )
+
+        programs = day_14_docking_data.parse_programs(lines=lines)
+        self.assertEqual(2, len(programs))
+
+        memory = day_14_docking_data.execute_programs(programs=programs)
+        self.assertDictEqual({7: 101, 8: 1}, memory.slots)  # type: ignore
+
+    def test_v2(self) -> None:
+        lines = common.Lines(
+            textwrap.dedent(
+                """\
+                mask = 000000000000000000000000000000X1001X
+                mem[42] = 100
+                mask = 00000000000000000000000000000000X0XX
+                mem[26] = 1"""
+            ).splitlines()
+        )
+
+        programs = day_14_docking_data.parse_programs(lines=lines)
+        writes = day_14_docking_data.execute_v2(programs=programs)
+
+        self.assertEqual(208, day_14_docking_data.sum_memory_v2(writes=writes))
+
+    def test_v2_against_materialized_addresses(self) -> None:
+        lines = common.Lines(
+            textwrap.dedent(
+                """\
+                mask = 0000000000000000000000000000XX1X0XX1
+                mem[3] = 7
+                mem[200] = 13
+                mask = 00000000000000000000000000000XX0X10X
+                mem[17] = 5
+                mem[3] = 2
+                mask = 000000000000000000000000000X00XXX000
+                mem[64] = 11"""
+            ).splitlines()
+        )
+
+        programs = day_14_docking_data.parse_programs(lines=lines)
+
+        slots = dict()  # type: Dict[int, int]
+        for program in programs:
+            floating = day_14_docking_data.floating_bits(program.mask)
+            for write in program.writes:
+                base = (write.address | program.mask.setting) & ~floating
+                subset = floating
+                while True:
+                    slots[base | subset] = write.value
+                    if subset == 0:
+                        break
+                    subset = (subset - 1) & floating
+
+        writes = day_14_docking_data.execute_v2(programs=programs)
+        self.assertEqual(
+            sum(slots.values()), day_14_docking_data.sum_memory_v2(writes=writes)
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,7 @@
 import textwrap
 import unittest
 
+import icontract
 import icontract_hypothesis
 
 from python_by_contract_corpus import common
@@ -14,6 +15,8 @@ class TestWithIcontractHypothesis(unittest.TestCase):
             day_16_ticket_translation.invalid_fields,
             day_16_ticket_translation.list_all_invalid_values,
             day_16_ticket_translation.compute_error_rate,
+            day_16_ticket_translation.index_rules,
+            day_16_ticket_translation.determine_fields,
         ]:
             try:
                 icontract_hypothesis.test_with_inferred_strategy(func)  # type: ignore
@@ -68,6 +71,135 @@ class TestManually(unittest.TestCase):
         )
         self.assertEqual(71, error_rate)
 
+    def test_invalid_fields_with_index(self) -> None:
+        rules = [
+            day_16_ticket_translation.Rule(identifier="class", ranges=[(1, 3), (5, 7)]),
+            day_16_ticket_translation.Rule(
+                identifier="row", ranges=[(6, 11), (33, 44)]
+            ),
+        ]
+
+        index = day_16_ticket_translation.index_rules(rules=rules)
+
+        for ticket, expected in [([7, 3, 47], [47]), ([4, 33, 12], [4, 12])]:
+            self.assertListEqual(
+                expected,
+                day_16_ticket_translation.invalid_fields(
+                    rules=rules, ticket=ticket, index=index
+                ),
+            )
+            self.assertListEqual(
+                expected,
+                day_16_ticket_translation.invalid_fields(rules=rules, ticket=ticket),
+            )
+
+    @unittest.skipUnless(icontract.SLOW, "The index is only checked with SLOW")
+    def test_invalid_fields_with_stale_index(self) -> None:
+        rules = [
+            day_16_ticket_translation.Rule(identifier="class", ranges=[(1, 3), (5, 7)])
+        ]
+
+        index = day_16_ticket_translation.index_rules(rules=rules)
+
+        with self.assertRaises(icontract.ViolationError):
+            day_16_ticket_translation.invalid_fields(
+                rules=rules
+                + [day_16_ticket_translation.Rule(identifier="row", ranges=[(4, 4)])],
+                ticket=[4],
+                index=index,
+            )
+
+    def test_matrix_with_single_field(self) -> None:
+        matrix = day_16_ticket_translation.parse_nearby_ticket_matrix("1\n2")
+
+        self.assertEqual(1, matrix.width)
+        self.assertEqual(2, matrix.height)
+        self.assertListEqual([1, 2], list(matrix.values))
+
+    def test_matrix(self) -> None:
+        rules = [
+            day_16_ticket_translation.Rule(identifier="class", ranges=[(1, 3), (5, 7)]),
+            day_16_ticket_translation.Rule(
+                identifier="row", ranges=[(6, 11), (33, 44)]
+            ),
+            day_16_ticket_translation.Rule(
+                identifier="seat", ranges=[(13, 40), (45, 50)]
+            ),
+        ]
+
+        matrix = day_16_ticket_translation.parse_nearby_ticket_matrix(
+            text="7,3,47\n40,4,50\n55,2,20\n38,6,12"
+        )
+
+        self.assertEqual(3, matrix.width)
+        self.assertEqual(4, matrix.height)
+        self.assertListEqual(
+            [3, 4, 2, 6], list(day_16_ticket_translation.column(matrix, 1))
+        )
+
+        self.assertListEqual(
+            [4, 55, 12],
+            day_16_ticket_translation.list_all_invalid_values_in_matrix(
+                rules=rules, matrix=matrix
+            ),
+        )
+
+    def test_index_merges_ranges(self) -> None:
+        rules = [
+            day_16_ticket_translation.Rule(identifier="a", ranges=[(1, 3), (5, 7)]),
+            day_16_ticket_translation.Rule(identifier="b", ranges=[(2, 4), (8, 9)]),
+        ]
+
+        index = day_16_ticket_translation.index_rules(rules=rules)
+
+        self.assertListEqual([1, 2, 4, 5, 8, 10], index.boundaries)
+        self.assertListEqual([0b01, 0b11, 0b10, 0b01, 0b10, 0], index.masks)
+
+        self.assertListEqual(
+            [0, 0b01, 0b11, 0b11, 0b10, 0b01, 0b01, 0b01, 0b10, 0b10, 0],
+            [
+                day_16_ticket_translation.matching_rules(index=index, value=value)
+                for value in range(11)
+            ],
+        )
+
+    def test_determine_fields(self) -> None:
+        rule_lines = common.Lines(
+            textwrap.dedent(
+                """\
+                class: 0-1 or 4-19
+                row: 0-5 or 8-19
+                seat: 0-13 or 16-19"""
+            ).splitlines()
+        )
+
+        rules = [
+            day_16_ticket_translation.Rule(
+                identifier=parsing.identifier, ranges=parsing.ranges
+            )
+            for parsing in day_16_ticket_translation.parse_rules(lines=rule_lines)
+        ]
+
+        nearby_tickets = day_16_ticket_translation.parse_nearby_tickets(
+            lines=["3,9,18", "15,1,5", "5,14,9", "100,1,1"]
+        )
+
+        fields = day_16_ticket_translation.determine_fields(
+            rules=rules, tickets=nearby_tickets
+        )
+        assert fields is not None
+        self.assertListEqual(["row", "class", "seat"], fields)
+
+    def test_determine_fields_ambiguous(self) -> None:
+        rules = [
+            day_16_ticket_translation.Rule(identifier="a", ranges=[(0, 10)]),
+            day_16_ticket_translation.Rule(identifier="b", ranges=[(0, 10)]),
+        ]
+
+        self.assertIsNone(
+            day_16_ticket_translation.determine_fields(rules=rules, tickets=[[1, 2]])
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -103,6 +103,106 @@ class TestManually(unittest.TestCase):
         for node, result in zip(self.test_nodes, self.test_results):
             self.assertEqual(result, day_18_operation_order.compute(node))
 
+    def test_compile_to_postfix(self) -> None:
+        node = day_18_operation_order.parse_iteratively("(1+2)*3")
+        assert node is not None
+
+        self.assertListEqual(
+            [
+                1,
+                2,
+                day_18_operation_order.Operation.ADD,
+                3,
+                day_18_operation_order.Operation.MUL,
+            ],
+            day_18_operation_order.compile_to_postfix(node),
+        )
+
+    def test_deep_nesting(self) -> None:
+        # The serialization is checked against the recursive parser in
+        # the post-condition, which takes exponential time in the depth,
+        # so we can not go deep here.
+        depth = 10
+        expr = "(" * depth + "1+2" + ")*3" * depth
+        node = day_18_operation_order.parse_iteratively(expr)
+        assert node is not None
+        self.assertEqual(expr, day_18_operation_order.serialize(node))
+
+        # We construct the deep tree directly as the parser checks itself
+        # against the recursive parser in the slow post-conditions.
+        depth = 10000
+        node = day_18_operation_order.Node(
+            head=1,
+            tail=[
+                day_18_operation_order.Tail(
+                    op=day_18_operation_order.Operation.ADD, right=2
+                )
+            ],
+        )
+        for _ in range(depth):
+            node = day_18_operation_order.Node(
+                head=node,
+                tail=[
+                    day_18_operation_order.Tail(
+                        op=day_18_operation_order.Operation.MUL, right=3
+                    )
+                ],
+            )
+
+        self.assertEqual(3 ** (depth + 1), day_18_operation_order.compute(node))
+
+        # The slow post-condition of the serialization parses the result
+        # recursively, which can not cope with this depth, so we test
+        # the iterative traversal directly.
+        self.assertEqual(
+            "(" * depth + "1+2" + ")*3" * depth,
+            day_18_operation_order._serialize(node),
+        )
+
+    def test_parse_iteratively(self) -> None:
+        for expr, node in zip(self.test_expressions, self.test_nodes):
+            self.assertEqual(node, day_18_operation_order.parse_iteratively(expr))
+
+        self.assertIsNone(day_18_operation_order.parse_iteratively(""))
+
+    def test_parse_iteratively_same_as_parse(self) -> None:
+        for expr in ["1", "-3", "(1)", "((1))", "1+-2", "((2*3)+(4))*5+(6)"]:
+            self.assertEqual(
+                day_18_operation_order.parse(expr),
+                day_18_operation_order.parse_iteratively(expr),
+            )
+
+    def test_parse_iteratively_with_spaces(self) -> None:
+        self.assertEqual(
+            self.test_nodes[2],
+            day_18_operation_order.parse_iteratively("1 + 2 * 3 + 4 + 6 * 7"),
+        )
+
+    def test_parse_iteratively_invalid(self) -> None:
+        for expr in ["1+", "(1", "1)", "()", "1 2", "1-2", "1/2", "*1"]:
+            with self.assertRaises(ValueError, msg=expr):
+                day_18_operation_order.parse_iteratively(expr)
+
+    def test_addition_first(self) -> None:
+        for expr, expected in [
+            ("1 + (2 * 3) + (4 * (5 + 6))", 51),
+            ("2 * 3 + (4 * 5)", 46),
+            ("5 + (8 * 3 + 9 + 3 * 4 * 3)", 1445),
+            ("5 * 9 * (7 * 3 * 3 + 9 * 3 + (8 + 6 * 4))", 669060),
+            ("((2 + 4 * 9) * (6 + 9 * 8 + 6) + 6) + 2 + 4 * 2", 23340),
+        ]:
+            node = day_18_operation_order.parse_iteratively(
+                expr, precedence=day_18_operation_order.ADDITION_FIRST
+            )
+            assert node is not None
+            self.assertEqual(expected, day_18_operation_order.compute(node), expr)
+
+        node = day_18_operation_order.parse_iteratively(
+            "1+2*3+4", precedence=day_18_operation_order.ADDITION_FIRST
+        )
+        assert node is not None
+        self.assertEqual("(1+2)*(3+4)", day_18_operation_order.serialize(node))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -9,9 +9,12 @@ from python_by_contract_corpus.correct.aoc2020 import day_1_report_repair
 
 class TestWithIcontractHypothesis(unittest.TestCase):
     def test_functions(self) -> None:
-        for func in [day_1_report_repair.find_pair_with_sum]:
+        for func in [
+            day_1_report_repair.find_pair_with_sum,
+            day_1_report_repair.find_tuple_with_sum,
+        ]:
             try:
-                icontract_hypothesis.test_with_inferred_strategy(func)
+                icontract_hypothesis.test_with_inferred_strategy(func)  # type: ignore
             except Exception as error:
                 raise Exception(
                     f"Automatically testing {func} with icontract-hypothesis failed "
@@ -231,6 +234,28 @@ class TestManually(unittest.TestCase):
         assert ret is not None
         self.assertEqual(1016131, ret[0] * ret[1])
 
+    def test_triple_on_puzzle_example(self) -> None:
+        entries = [1721, 979, 366, 299, 675, 1456]
+        ret = day_1_report_repair.find_tuple_with_sum(entries, 2020, 3)
+        assert ret is not None
+        self.assertEqual(241861950, ret[0] * ret[1] * ret[2])
+
+    def test_pair_of_same_numbers(self) -> None:
+        self.assertIsNone(day_1_report_repair.find_pair_with_sum([1010], 2020))
+        self.assertEqual(
+            (1010, 1010), day_1_report_repair.find_pair_with_sum([1010, 1010], 2020)
+        )
+
+    def test_tuple_of_same_numbers(self) -> None:
+        self.assertIsNone(day_1_report_repair.find_tuple_with_sum([1, 1, 2], 3, 3))
+        self.assertEqual(
+            (1, 1, 1), day_1_report_repair.find_tuple_with_sum([1, 2, 1, 1], 3, 3)
+        )
+        self.assertEqual(
+            (1, 2, 3, 4),
+            day_1_report_repair.find_tuple_with_sum([4, 3, 9, 2, 1], 10, 4),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
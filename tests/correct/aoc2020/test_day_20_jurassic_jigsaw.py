@@ -7,6 +7,7 @@ from python_by_contract_corpus.correct.aoc2020.day_20_jurassic_jigsaw import (
     Image,
     parse_tile,
     parse_tiles,
+    parse_tiles_from_lines,
     place_tiles,
     ValidTileText,
 )
@@ -93,9 +94,8 @@ class TestManually(unittest.TestCase):
         self.assertEqual(tile.left, ".#..#####.")
 
     def test_example(self) -> None:
-        tiles = parse_tiles(
-            textwrap.dedent(
-                """\
+        text = textwrap.dedent(
+            """\
                 Tile 2311:
                 ..##.#..#.
                 ##..#.....
@@ -204,8 +204,10 @@ class TestManually(unittest.TestCase):
                 ..#.......
                 ..#.###...
                 """
-            )
         )
+        tiles = parse_tiles(text)
+        self.assertEqual(tiles, parse_tiles_from_lines(text.splitlines()))
+
         image = place_tiles(tiles)
         assert image is not None
         ids = [tid for tid, _ in image.tiles]
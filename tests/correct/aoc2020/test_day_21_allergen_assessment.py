@@ -26,19 +26,20 @@ class TestWithIcontractHypothesis(unittest.TestCase):
                 ) from error
 
 
+EXAMPLE_TEXT = textwrap.dedent(
+    """\
+    mxmxvkd kfcds sqjhc nhms (contains dairy, fish)
+    trh fvjkl sbzzf mxmxvkd (contains dairy)
+    sqjhc fvjkl (contains soy)
+    sqjhc mxmxvkd sbzzf (contains fish)"""
+)
+
+
 class TestManually(unittest.TestCase):
     def test_solve(self) -> None:
-        text = textwrap.dedent(
-            """\
-            mxmxvkd kfcds sqjhc nhms (contains dairy, fish)
-            trh fvjkl sbzzf mxmxvkd (contains dairy)
-            sqjhc fvjkl (contains soy)
-            sqjhc mxmxvkd sbzzf (contains fish)"""
-        )
-
         puzzle_input = [
             day_21_allergen_assessment.IngredientLine(line)
-            for line in text.splitlines()
+            for line in EXAMPLE_TEXT.splitlines()
         ]
 
         expected_output = {"kfcds", "nhms", "sbzzf", "trh"}
@@ -47,6 +48,38 @@ class TestManually(unittest.TestCase):
             expected_output, day_21_allergen_assessment.solve(puzzle_input)
         )
 
+    def test_count_non_allergenic_occurrences(self) -> None:
+        entries = [
+            day_21_allergen_assessment.parse_ingredient_line(
+                day_21_allergen_assessment.IngredientLine(line)
+            )
+            for line in EXAMPLE_TEXT.splitlines()
+        ]
+
+        self.assertEqual(
+            5, day_21_allergen_assessment.count_non_allergenic_occurrences(entries)
+        )
+
+    def test_resolve_allergens(self) -> None:
+        entries = [
+            day_21_allergen_assessment.parse_ingredient_line(
+                day_21_allergen_assessment.IngredientLine(line)
+            )
+            for line in EXAMPLE_TEXT.splitlines()
+        ]
+
+        mapping = day_21_allergen_assessment.resolve_allergens(entries)
+        assert mapping is not None
+
+        self.assertDictEqual(
+            {"dairy": "mxmxvkd", "fish": "sqjhc", "soy": "fvjkl"}, dict(mapping)
+        )
+
+        self.assertEqual(
+            "mxmxvkd,sqjhc,fvjkl",
+            day_21_allergen_assessment.list_dangerous_ingredients(mapping),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
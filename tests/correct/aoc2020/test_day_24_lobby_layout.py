@@ -12,6 +12,11 @@ class TestWithIcontractHypothesis(unittest.TestCase):
             day_24_lobby_layout.parse_line,
             day_24_lobby_layout.stringify_directions,
             day_24_lobby_layout.count_flips,
+            day_24_lobby_layout.follow_directions_axially,
+            day_24_lobby_layout.pack_cell,
+            day_24_lobby_layout.unpack_cell,
+            day_24_lobby_layout.flip_tiles,
+            day_24_lobby_layout.parse_batch,
         ]:
             try:
                 icontract_hypothesis.test_with_inferred_strategy(func)  # type: ignore
@@ -43,33 +48,34 @@ class TestParseLine(unittest.TestCase):
         self.assertEqual("", result)
 
 
+EXAMPLE_TEXT = textwrap.dedent(
+    """\
+    sesenwnenenewseeswwswswwnenewsewsw
+    neeenesenwnwwswnenewnwwsewnenwseswesw
+    seswneswswsenwwnwse
+    nwnwneseeswswnenewneswwnewseswneseene
+    swweswneswnenwsewnwneneseenw
+    eesenwseswswnenwswnwnwsewwnwsene
+    sewnenenenesenwsewnenwwwse
+    wenwwweseeeweswwwnwwe
+    wsweesenenewnwwnwsenewsenwwsesesenwne
+    neeswseenwwswnwswswnw
+    nenwswwsewswnenenewsenwsenwnesesenew
+    enewnwewneswsewnwswenweswnenwsenwsw
+    sweneswneswneneenwnewenewwneswswnese
+    swwesenesewenwneswnwwneseswwne
+    enesenwswwswneneswsenwnewswseenwsese
+    wnwnesenesenenwwnenwsewesewsesesew
+    nenewswnwewswnenesenwnesewesw
+    eneswnwswnwsenenwnwnwwseeswneewsenese
+    neswnwewnwnwseenwseesewsenwsweewe
+    wseweeenwnesenwwwswnew"""
+)
+
+
 class TestCounFlips(unittest.TestCase):
     def test_case(self) -> None:
-        text = textwrap.dedent(
-            """\
-            sesenwnenenewseeswwswswwnenewsewsw
-            neeenesenwnwwswnenewnwwsewnenwseswesw
-            seswneswswsenwwnwse
-            nwnwneseeswswnenewneswwnewseswneseene
-            swweswneswnenwsewnwneneseenw
-            eesenwseswswnenwswnwnwsewwnwsene
-            sewnenenenesenwsewnenwwwse
-            wenwwweseeeweswwwnwwe
-            wsweesenenewnwwnwsenewsenwwsesesenwne
-            neeswseenwwswnwswswnw
-            nenwswwsewswnenenewsenwsenwnesesenew
-            enewnwewneswsewnwswenweswnenwsenwsw
-            sweneswneswneneenwnewenewwneswswnese
-            swwesenesewenwneswnwwneseswwne
-            enesenwswwswneneswsenwnewswseenwsese
-            wnwnesenesenenwwnenwsewesewsesesew
-            nenewswnwewswnenesenwnesewesw
-            eneswnwswnwsenenwnwnwwseeswneewsenese
-            neswnwewnwnwseenwseesewsenwsweewe
-            wseweeenwnesenwwwswnew"""
-        )
-
-        lines = text.split("\n")
+        lines = EXAMPLE_TEXT.split("\n")
 
         plan = [day_24_lobby_layout.parse_line(line) for line in lines]
 
@@ -77,5 +83,68 @@ class TestCounFlips(unittest.TestCase):
         self.assertEqual(10, result)
 
 
+class TestFlipTiles(unittest.TestCase):
+    def test_case(self) -> None:
+        lines = EXAMPLE_TEXT.split("\n")
+
+        plan = [day_24_lobby_layout.parse_line(line) for line in lines]
+
+        black = day_24_lobby_layout.flip_tiles(plan=plan)
+        self.assertEqual(10, len(black))
+
+    def test_pack_negative_coordinates(self) -> None:
+        for q, r in [(0, 0), (-1, 0), (0, -1), (-3, 5), (7, -11)]:
+            key = day_24_lobby_layout.pack_cell(q, r)
+            self.assertEqual((q, r), day_24_lobby_layout.unpack_cell(key))
+
+
+class TestParseBatch(unittest.TestCase):
+    def test_case(self) -> None:
+        batch = day_24_lobby_layout.parse_batch(EXAMPLE_TEXT + "\n")
+
+        lines = EXAMPLE_TEXT.split("\n")
+        self.assertEqual(len(lines), len(batch))
+
+        for index, line in enumerate(lines):
+            self.assertListEqual(
+                day_24_lobby_layout.parse_line(line),
+                day_24_lobby_layout.decode_line(batch=batch, index=index),
+            )
+
+    def test_empty_lines(self) -> None:
+        self.assertEqual(0, len(day_24_lobby_layout.parse_batch("")))
+
+        batch = day_24_lobby_layout.parse_batch("\nnwe\n\nsw")
+        self.assertEqual(4, len(batch))
+        self.assertListEqual([0, 0, 2, 2, 3], list(batch.offsets))
+
+    def test_follow_batch_axially(self) -> None:
+        lines = EXAMPLE_TEXT.split("\n")
+
+        batch = day_24_lobby_layout.parse_batch(EXAMPLE_TEXT)
+
+        self.assertListEqual(
+            [
+                day_24_lobby_layout.follow_directions_axially(
+                    day_24_lobby_layout.parse_line(line)
+                )
+                for line in lines
+            ],
+            day_24_lobby_layout.follow_batch_axially(batch=batch),
+        )
+
+
+class TestSimulateDays(unittest.TestCase):
+    def test_case(self) -> None:
+        lines = EXAMPLE_TEXT.split("\n")
+
+        plan = [day_24_lobby_layout.parse_line(line) for line in lines]
+
+        self.assertEqual(10, day_24_lobby_layout.simulate_days(plan=plan, days=0))
+        self.assertEqual(15, day_24_lobby_layout.simulate_days(plan=plan, days=1))
+        self.assertEqual(37, day_24_lobby_layout.simulate_days(plan=plan, days=10))
+        self.assertEqual(2208, day_24_lobby_layout.simulate_days(plan=plan, days=100))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,4 @@
+import math
 import unittest
 
 import icontract_hypothesis
@@ -8,16 +9,24 @@ from python_by_contract_corpus.correct.aoc2020 import day_25_combo_breaker
 
 class TestWithIcontractHypothesis(unittest.TestCase):
     def test_functions(self) -> None:
-        # We need to add more constraints so that the function is testable.
-        @require(lambda loop_size: loop_size >= 0)
-        @require(lambda loop_size: loop_size < 1000)
+        # We need to add more constraints so that the function is testable
+        # in a reasonable time as the discrete logarithm scales with the modulus.
         @require(lambda subject: subject >= 0)
-        def transform_testable(subject: int, loop_size: int) -> int:
-            return day_25_combo_breaker.transform(subject, loop_size)
+        @require(lambda modulus: 2 <= modulus < 100000)
+        # fmt: off
+        @require(
+            lambda subject, modulus:
+            subject % modulus == 0 or math.gcd(subject, modulus) == 1
+        )
+        # fmt: on
+        def deduce_loop_size_testable(
+            subject: int, public_key: int, modulus: int
+        ) -> int:
+            return day_25_combo_breaker.deduce_loop_size(subject, public_key, modulus)
 
-        for func in [transform_testable]:
+        for func in [day_25_combo_breaker.transform, deduce_loop_size_testable]:
             try:
-                icontract_hypothesis.test_with_inferred_strategy(func)
+                icontract_hypothesis.test_with_inferred_strategy(func)  # type: ignore
             except Exception as error:
                 raise Exception(
                     f"Automatically testing {func} with icontract-hypothesis failed "
@@ -31,6 +40,26 @@ class TestManually(unittest.TestCase):
             12227206, day_25_combo_breaker.deduce_encryption_key(9093927, 11001876)
         )
 
+    def test_deduce_loop_size(self) -> None:
+        self.assertEqual(8, day_25_combo_breaker.deduce_loop_size(7, 5764801))
+        self.assertEqual(11, day_25_combo_breaker.deduce_loop_size(7, 17807724))
+
+    def test_deduce_encryption_key_on_puzzle_example(self) -> None:
+        self.assertEqual(
+            14897079, day_25_combo_breaker.deduce_encryption_key(17807724, 5764801)
+        )
+
+    def test_deduce_loop_size_with_small_modulus(self) -> None:
+        # 3 is a generator modulo 17.
+        for loop_size in range(16):
+            public_key = day_25_combo_breaker.transform(3, loop_size, 17)
+            self.assertEqual(
+                loop_size, day_25_combo_breaker.deduce_loop_size(3, public_key, 17)
+            )
+
+        # 2 generates only the half of the group modulo 17.
+        self.assertEqual(-1, day_25_combo_breaker.deduce_loop_size(2, 3, 17))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,6 @@
+import os
+import tempfile
+import textwrap
 import unittest
 
 import icontract_hypothesis
@@ -11,9 +14,11 @@ class TestWithIcontractHypothesis(unittest.TestCase):
             # NOTE: test ``verify`` once icontract-hypothesis is more powerful.
             # day_2_password_philosophy.verify,
             day_2_password_philosophy.verify_line,
+            day_2_password_philosophy.verify_positions,
+            day_2_password_philosophy.verify_line_positions,
         ]:
             try:
-                icontract_hypothesis.test_with_inferred_strategy(func)
+                icontract_hypothesis.test_with_inferred_strategy(func)  # type: ignore
             except Exception as error:
                 raise Exception(
                     f"Automatically testing {func} with icontract-hypothesis failed "
@@ -34,5 +39,59 @@ class TestManually(unittest.TestCase):
             self.assertEqual(expected_result, result)
 
 
+EXAMPLE_TEXT = textwrap.dedent(
+    """\
+    1-3 a: abcde
+    1-3 b: cdefg
+    2-9 c: ccccccccc
+    """
+)
+
+
+class TestBulk(unittest.TestCase):
+    def test_count_valid_passwords(self) -> None:
+        self.assertEqual(
+            2,
+            day_2_password_philosophy.count_valid_passwords(
+                EXAMPLE_TEXT, day_2_password_philosophy.Policy.COUNT
+            ),
+        )
+        self.assertEqual(
+            1,
+            day_2_password_philosophy.count_valid_passwords(
+                EXAMPLE_TEXT, day_2_password_philosophy.Policy.POSITION
+            ),
+        )
+
+    def test_count_valid_passwords_with_crlf(self) -> None:
+        text = EXAMPLE_TEXT.replace("\n", "\r\n")
+
+        for policy in day_2_password_philosophy.Policy:
+            self.assertEqual(
+                day_2_password_philosophy.count_valid_passwords(EXAMPLE_TEXT, policy),
+                day_2_password_philosophy.count_valid_passwords(text, policy),
+            )
+
+    def test_count_valid_passwords_in_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "database.txt")
+
+            for text in ["", EXAMPLE_TEXT * 100, EXAMPLE_TEXT.replace("\n", "\r\n")]:
+                with open(path, "wt", newline="") as file:
+                    file.write(text)
+
+                for policy in day_2_password_philosophy.Policy:
+                    expected = day_2_password_philosophy.count_valid_passwords(
+                        text, policy
+                    )
+                    for use_mmap in [True, False]:
+                        self.assertEqual(
+                            expected,
+                            day_2_password_philosophy.count_valid_passwords_in_file(
+                                path, policy, use_mmap=use_mmap
+                            ),
+                        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,9 @@
+import os
+import tempfile
 import textwrap
 import unittest
 
+import icontract
 import icontract_hypothesis
 
 from python_by_contract_corpus.correct.aoc2020 import day_3_toboggan_trajectory
@@ -25,26 +28,30 @@ class TestWithIcontractHypothesis(unittest.TestCase):
                 ) from error
 
 
+EXAMPLE_INPUT = textwrap.dedent(
+    """\
+    ..##.......
+    #...#...#..
+    .#....#..#.
+    ..#.#...#.#
+    .#...##..#.
+    ..#.##.....
+    .#.#.#....#
+    .#........#
+    #.##...#...
+    #...##....#
+    .#..#...#.#"""
+)
+
+#: Slopes of the second part of the puzzle
+SLOPES = [(1, 1), (3, 1), (5, 1), (7, 1), (1, 2)]
+
+
 class TestManually(unittest.TestCase):
     def test_case(self) -> None:
-        example_input = textwrap.dedent(
-            """\
-            ..##.......
-            #...#...#..
-            .#....#..#.
-            ..#.#...#.#
-            .#...##..#.
-            ..#.##.....
-            .#.#.#....#
-            .#........#
-            #.##...#...
-            #...##....#
-            .#..#...#.#"""
-        )
-
         lines = [
             day_3_toboggan_trajectory.InputLine(line)
-            for line in example_input.splitlines()
+            for line in EXAMPLE_INPUT.splitlines()
         ]
 
         self.assertEqual(
@@ -54,6 +61,44 @@ class TestManually(unittest.TestCase):
             ),
         )
 
+    def test_count_trees_on_slopes(self) -> None:
+        lines = [
+            day_3_toboggan_trajectory.InputLine(line)
+            for line in EXAMPLE_INPUT.splitlines()
+        ]
+
+        self.assertListEqual(
+            [2, 7, 3, 4, 2],
+            day_3_toboggan_trajectory.count_trees_on_slopes(
+                *day_3_toboggan_trajectory.parse_input(lines), SLOPES
+            ),
+        )
+
+    def test_count_trees_in_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "map.txt")
+
+            for text in [EXAMPLE_INPUT, EXAMPLE_INPUT + "\n"]:
+                with open(path, "wt") as file:
+                    file.write(text)
+
+                for processes in [1, 3]:
+                    self.assertListEqual(
+                        [2, 7, 3, 4, 2],
+                        day_3_toboggan_trajectory.count_trees_in_file(
+                            path, SLOPES, processes=processes
+                        ),
+                    )
+
+    def test_count_trees_in_file_with_empty_first_line(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "map.txt")
+            with open(path, "wt") as file:
+                file.write("\n" + EXAMPLE_INPUT)
+
+            with self.assertRaises(icontract.ViolationError):
+                day_3_toboggan_trajectory.count_trees_in_file(path, SLOPES)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import textwrap
 import unittest
 
@@ -10,11 +12,13 @@ class TestWithIcontractHypothesis(unittest.TestCase):
     def test_functions(self) -> None:
         for func in [
             day_4_passport_processing.is_valid,
+            day_4_passport_processing.is_field_valid,
+            day_4_passport_processing.is_strictly_valid,
             # NOTE: the preconditions for this one are too challenging to meet right now
             # day_4_passport_processing.count_valid
         ]:
             try:
-                icontract_hypothesis.test_with_inferred_strategy(func)
+                icontract_hypothesis.test_with_inferred_strategy(func)  # type: ignore
             except Exception as error:
                 raise Exception(
                     f"Automatically testing {func} with icontract-hypothesis failed "
@@ -22,27 +26,150 @@ class TestWithIcontractHypothesis(unittest.TestCase):
                 ) from error
 
 
+SAMPLE_BATCH = textwrap.dedent(
+    """\
+    ecl:gry pid:860033327 eyr:2020 hcl:#fffffd
+    byr:1937 iyr:2017 cid:147 hgt:183cm
+
+    iyr:2013 ecl:amb cid:350 eyr:2023 pid:028048884
+    hcl:#cfa07d byr:1929
+
+    hcl:#ae17e1 iyr:2013
+    eyr:2024
+    ecl:brn pid:760753108 byr:1931
+    hgt:179cm
+
+    hcl:#cfa07d eyr:2025 pid:166559648
+    iyr:2011 ecl:brn hgt:59in
+    """
+)
+
+INVALID_BATCH = textwrap.dedent(
+    """\
+    eyr:1972 cid:100
+    hcl:#18171d ecl:amb hgt:170 pid:186cm iyr:2018 byr:1926
+
+    iyr:2019
+    hcl:#602927 eyr:1967 hgt:170cm
+    ecl:grn pid:012533040 byr:1946
+
+    hcl:dab227 iyr:2012
+    ecl:brn hgt:182cm pid:021572410 eyr:2020 byr:1992 cid:277
+
+    hgt:59cm ecl:zzz
+    eyr:2038 hcl:74454a iyr:2023
+    pid:3556412378 byr:2007
+    """
+)
+
+VALID_BATCH = textwrap.dedent(
+    """\
+    pid:087499704 hgt:74in ecl:grn iyr:2012 eyr:2030 byr:1980
+    hcl:#623a2f
+
+    eyr:2029 ecl:blu cid:129 byr:1989
+    iyr:2014 pid:896056539 hcl:#a97842 hgt:165cm
+
+    hcl:#888785
+    hgt:164cm byr:2001 iyr:2015 cid:88
+    pid:545766238 ecl:hzl
+    eyr:2022
+
+    iyr:2010 hgt:158cm hcl:#b6652a ecl:blu byr:1944 eyr:2021 pid:093154719
+    """
+)
+
+
 class TestManually(unittest.TestCase):
     def test_count_valid(self) -> None:
-        sample_batch = textwrap.dedent(
-            """\
-            ecl:gry pid:860033327 eyr:2020 hcl:#fffffd
-            byr:1937 iyr:2017 cid:147 hgt:183cm
-    
-            iyr:2013 ecl:amb cid:350 eyr:2023 pid:028048884
-            hcl:#cfa07d byr:1929
-    
-            hcl:#ae17e1 iyr:2013
-            eyr:2024
-            ecl:brn pid:760753108 byr:1931
-            hgt:179cm
-    
-            hcl:#cfa07d eyr:2025 pid:166559648
-            iyr:2011 ecl:brn hgt:59in
-            """
+        self.assertEqual(2, day_4_passport_processing.count_valid(SAMPLE_BATCH))
+
+    def test_count_valid_in_stream(self) -> None:
+        lines = iter(SAMPLE_BATCH.splitlines(keepends=True))
+        self.assertEqual(2, day_4_passport_processing.count_valid_in_stream(lines))
+
+    def test_is_field_valid(self) -> None:
+        for key, value, expected in [
+            ("byr", "2002", True),
+            ("byr", "2003", False),
+            ("hgt", "60in", True),
+            ("hgt", "190cm", True),
+            ("hgt", "190in", False),
+            ("hgt", "190", False),
+            ("hcl", "#123abc", True),
+            ("hcl", "#123abz", False),
+            ("hcl", "123abc", False),
+            ("ecl", "brn", True),
+            ("ecl", "wat", False),
+            ("pid", "000000001", True),
+            ("pid", "0123456789", False),
+            ("cid", "anything", True),
+        ]:
+            self.assertEqual(
+                expected,
+                day_4_passport_processing.is_field_valid(key, value),
+                f"{key}:{value}",
+            )
+
+    def test_strict(self) -> None:
+        self.assertEqual(
+            0,
+            day_4_passport_processing.count_valid_in_stream(
+                INVALID_BATCH.splitlines(), strict=True
+            ),
+        )
+        self.assertEqual(
+            4,
+            day_4_passport_processing.count_valid_in_stream(
+                VALID_BATCH.splitlines(), strict=True
+            ),
         )
 
-        self.assertEqual(2, day_4_passport_processing.count_valid(sample_batch))
+
+class TestFile(unittest.TestCase):
+    def test_shards(self) -> None:
+        batch = "\n".join([SAMPLE_BATCH, INVALID_BATCH, VALID_BATCH] * 10)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.txt")
+            with open(path, "wt") as file:
+                file.write(batch)
+
+            for shard_count in [1, 2, 3, 7, 100]:
+                boundaries = day_4_passport_processing.find_shard_boundaries(
+                    path, shard_count
+                )
+
+                self.assertEqual(
+                    60,
+                    sum(
+                        day_4_passport_processing.count_valid_in_shard(
+                            path, start, end, strict=True
+                        )
+                        for start, end in zip(boundaries, boundaries[1:])
+                    ),
+                )
+
+            self.assertEqual(
+                100, day_4_passport_processing.count_valid_in_file(path, processes=2)
+            )
+            self.assertEqual(
+                60,
+                day_4_passport_processing.count_valid_in_file(
+                    path, strict=True, processes=2
+                ),
+            )
+
+    def test_empty_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "batch.txt")
+            with open(path, "wt"):
+                pass
+
+            self.assertEqual(
+                [0, 0], day_4_passport_processing.find_shard_boundaries(path, 3)
+            )
+            self.assertEqual(0, day_4_passport_processing.count_valid_in_file(path))
 
 
 if __name__ == "__main__":
@@ -10,6 +10,8 @@ class TestWithIcontractHypothesis(unittest.TestCase):
         for func in [
             day_5_binary_boarding.determine_row_and_column,
             day_5_binary_boarding.determine_id,
+            day_5_binary_boarding.decode_seat_id,
+            day_5_binary_boarding.find_missing_seat,
         ]:
             try:
                 icontract_hypothesis.test_with_inferred_strategy(func)  # type: ignore
@@ -39,6 +41,26 @@ class TestManually(unittest.TestCase):
             self.assertEqual(expected_column, column, identifier)
             self.assertEqual(expected_id, seat_id, identifier)
 
+            self.assertEqual(
+                expected_id,
+                day_5_binary_boarding.decode_seat_id(identifier=identifier),
+                identifier,
+            )
+
+    def test_decode_seat_ids(self) -> None:
+        self.assertListEqual(
+            [567, 119, 820],
+            day_5_binary_boarding.decode_seat_ids(
+                "BFFFBBFRRR\nFFFBBBFRRR\nBBFFBBFRLL\n"
+            ),
+        )
+
+    def test_find_missing_seat(self) -> None:
+        seat_ids = [seat_id for seat_id in range(100, 200) if seat_id != 150]
+
+        self.assertEqual(150, day_5_binary_boarding.find_missing_seat(seat_ids))
+        self.assertIsNone(day_5_binary_boarding.find_missing_seat(list(range(10))))
+
 
 if __name__ == "__main__":
     unittest.main()
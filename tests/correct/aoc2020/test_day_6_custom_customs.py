@@ -8,7 +8,11 @@ from python_by_contract_corpus.correct.aoc2020 import day_6_custom_customs
 
 class TestWithIcontractHypothesis(unittest.TestCase):
     def test_functions(self) -> None:
-        for func in [day_6_custom_customs.solve]:
+        for func in [
+            day_6_custom_customs.answer_mask,
+            day_6_custom_customs.solve,
+            day_6_custom_customs.solve_everyone,
+        ]:
             try:
                 icontract_hypothesis.test_with_inferred_strategy(func)
             except Exception as error:
@@ -41,6 +45,15 @@ class TestManually(unittest.TestCase):
         )
 
         self.assertEqual(11, day_6_custom_customs.solve(example_data))
+        self.assertEqual(6, day_6_custom_customs.solve_everyone(example_data))
+
+    def test_solve_everyone_with_repeated_letters(self) -> None:
+        self.assertEqual(1, day_6_custom_customs.solve_everyone("aab\na"))
+
+    def test_count_answers_on_stream(self) -> None:
+        lines = iter(["abc\n", "\n", "\n", "ab\n", "ac\n", "\n", "xyz"])
+
+        self.assertEqual((9, 7), day_6_custom_customs.count_answers(lines))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import textwrap
 import unittest
+from typing import List, Union
 
 import icontract_hypothesis
 
@@ -19,25 +20,31 @@ class TestWithIcontractHypothesis(unittest.TestCase):
                 ) from error
 
 
+EXAMPLE_TEXT = textwrap.dedent(
+    """\
+    light red bags contain 1 bright white bag, 2 muted yellow bags.
+    dark orange bags contain 3 bright white bags, 4 muted yellow bags.
+    bright white bags contain 1 shiny gold bag.
+    muted yellow bags contain 2 shiny gold bags, 9 faded blue bags.
+    shiny gold bags contain 1 dark olive bag, 2 vibrant plum bags.
+    dark olive bags contain 3 faded blue bags, 4 dotted black bags.
+    vibrant plum bags contain 5 faded blue bags, 6 dotted black bags.
+    faded blue bags contain no other bags.
+    dotted black bags contain no other bags."""
+)
+
+
 class TestManually(unittest.TestCase):
     def test_on_example(self) -> None:
-        text = textwrap.dedent(
-            """\
-            light red bags contain 1 bright white bag, 2 muted yellow bags.
-            dark orange bags contain 3 bright white bags, 4 muted yellow bags.
-            bright white bags contain 1 shiny gold bag.
-            muted yellow bags contain 2 shiny gold bags, 9 faded blue bags.
-            shiny gold bags contain 1 dark olive bag, 2 vibrant plum bags.
-            dark olive bags contain 3 faded blue bags, 4 dotted black bags.
-            vibrant plum bags contain 5 faded blue bags, 6 dotted black bags.
-            faded blue bags contain no other bags.
-            dotted black bags contain no other bags."""
-        )
-
-        lines = common.Lines(text.splitlines())
+        lines = common.Lines(EXAMPLE_TEXT.splitlines())
 
         self.assertEqual(4, day_7_handy_haversacks.count_containers(lines))
 
+    def test_count_required_bags(self) -> None:
+        lines = common.Lines(EXAMPLE_TEXT.splitlines())
+
+        self.assertEqual(32, day_7_handy_haversacks.count_required_bags(lines))
+
     def test_parse_bagexpr(self) -> None:
         self.assertEqual(
             (1, "bright white"),
@@ -58,6 +65,141 @@ class TestManually(unittest.TestCase):
             day_7_handy_haversacks.parse_rule("faded blue bags contain no other bags."),
         )
 
+    def test_parse_rule_with_bag_in_kind(self) -> None:
+        text = "light red bags contain 1 blue bag red bags, 2 dark bags orange bag."
+
+        self.assertEqual(
+            ("light red", {"blue bag red": 1, "dark bags orange": 2}),
+            day_7_handy_haversacks.parse_rule(text),
+        )
+        self.assertDictEqual(
+            {"light red": {"blue bag red": 1, "dark bags orange": 2}},
+            {
+                kind: contents
+                for kind, contents in day_7_handy_haversacks.graph_to_rules(
+                    day_7_handy_haversacks.load_graph(text)
+                ).items()
+                if contents
+            },
+        )
+
+    def test_load_graph(self) -> None:
+        graph = day_7_handy_haversacks.load_graph(EXAMPLE_TEXT)
+
+        self.assertEqual(
+            4,
+            len(
+                day_7_handy_haversacks.find_containers(
+                    graph, graph.kind_ids["shiny gold"]
+                )
+            )
+            - 1,
+        )
+        self.assertEqual(
+            126,
+            day_7_handy_haversacks.count_contained_bags(
+                day_7_handy_haversacks.load_graph(
+                    textwrap.dedent(
+                        """\
+                        shiny gold bags contain 2 dark red bags.
+                        dark red bags contain 2 dark orange bags.
+                        dark orange bags contain 2 dark yellow bags.
+                        dark yellow bags contain 2 dark green bags.
+                        dark green bags contain 2 dark blue bags.
+                        dark blue bags contain 2 dark violet bags.
+                        dark violet bags contain no other bags.
+                        """
+                    )
+                ),
+                0,
+            ),
+        )
+
+    def test_load_graph_equals_parse_rules(self) -> None:
+        lines = common.Lines(EXAMPLE_TEXT.splitlines())
+
+        self.assertDictEqual(
+            day_7_handy_haversacks.graph_to_rules(
+                day_7_handy_haversacks.intern_rules(
+                    day_7_handy_haversacks.parse_rules(lines)
+                )
+            ),
+            day_7_handy_haversacks.graph_to_rules(
+                day_7_handy_haversacks.load_graph(EXAMPLE_TEXT)
+            ),
+        )
+
+    def test_load_graph_with_crlf(self) -> None:
+        self.assertDictEqual(
+            day_7_handy_haversacks.graph_to_rules(
+                day_7_handy_haversacks.load_graph(EXAMPLE_TEXT)
+            ),
+            day_7_handy_haversacks.graph_to_rules(
+                day_7_handy_haversacks.load_graph(EXAMPLE_TEXT.replace("\n", "\r\n"))
+            ),
+        )
+
+    def test_load_graph_from_bytes(self) -> None:
+        expected = day_7_handy_haversacks.graph_to_rules(
+            day_7_handy_haversacks.load_graph(EXAMPLE_TEXT)
+        )
+
+        for text in [EXAMPLE_TEXT, EXAMPLE_TEXT.replace("\n", "\r\n")]:
+            data = text.encode("utf-8")
+            buffers = [data, memoryview(data)]  # type: List[Union[bytes, memoryview]]
+            for buffer in buffers:
+                self.assertDictEqual(
+                    expected,
+                    day_7_handy_haversacks.graph_to_rules(
+                        day_7_handy_haversacks.load_graph_from_bytes(buffer)
+                    ),
+                )
+
+        graph = day_7_handy_haversacks.load_graph_from_bytes(
+            "ünï bags contain 2 cödé bags.\n".encode("utf-8")
+        )
+        self.assertListEqual(["ünï", "cödé"], graph.kinds)
+        self.assertDictEqual({"ünï": 0, "cödé": 1}, dict(graph.kind_ids))
+
+
+class TestRuleGraph(unittest.TestCase):
+    def test_deep_chain(self) -> None:
+        depth = 100000
+        rules = {
+            f"kind {i}": ({f"kind {i + 1}": 1} if i + 1 < depth else {})
+            for i in range(depth)
+        }  # type: day_7_handy_haversacks.Rules
+
+        graph = day_7_handy_haversacks.intern_rules(rules)
+
+        self.assertEqual(
+            depth,
+            len(
+                day_7_handy_haversacks.find_containers(
+                    graph, graph.kind_ids[f"kind {depth - 1}"]
+                )
+            ),
+        )
+
+        self.assertEqual(
+            depth - 1,
+            day_7_handy_haversacks.count_contained_bags(
+                graph, graph.kind_ids["kind 0"]
+            ),
+        )
+
+    def test_cycle(self) -> None:
+        rules = {
+            "a": {"b": 2},
+            "b": {"a": 1},
+        }  # type: day_7_handy_haversacks.Rules
+
+        graph = day_7_handy_haversacks.intern_rules(rules)
+
+        self.assertIsNone(
+            day_7_handy_haversacks.count_contained_bags(graph, graph.kind_ids["a"])
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
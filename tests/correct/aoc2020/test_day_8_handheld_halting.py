@@ -12,6 +12,7 @@ class TestWithIcontractHypothesis(unittest.TestCase):
         for func in [
             day_8_handheld_halting.parse,
             day_8_handheld_halting.execute_instructions,
+            day_8_handheld_halting.compile_instructions,
         ]:
             try:
                 icontract_hypothesis.test_with_inferred_strategy(func)  # type: ignore
@@ -22,23 +23,26 @@ class TestWithIcontractHypothesis(unittest.TestCase):
                 ) from error
 
 
+EXAMPLE_LINES = common.Lines(
+    textwrap.dedent(
+        """\
+        nop +0
+        acc +1
+        jmp +4
+        acc +3
+        jmp -3
+        acc -99
+        acc +1
+        jmp -4
+        acc +6
+        """
+    ).splitlines()
+)
+
+
 class TestManually(unittest.TestCase):
     def test_case(self) -> None:
-        lines = common.Lines(
-            textwrap.dedent(
-                """\
-                nop +0
-                acc +1
-                jmp +4
-                acc +3
-                jmp -3
-                acc -99
-                acc +1
-                jmp -4
-                acc +6
-                """
-            ).splitlines()
-        )
+        lines = EXAMPLE_LINES
 
         instructions = day_8_handheld_halting.parse(lines=lines)
 
@@ -47,5 +51,32 @@ class TestManually(unittest.TestCase):
         self.assertEqual(5, acc)
 
 
+class TestCompiled(unittest.TestCase):
+    def test_execute(self) -> None:
+        instructions = day_8_handheld_halting.parse(lines=EXAMPLE_LINES)
+        program = day_8_handheld_halting.compile_instructions(instructions)
+
+        self.assertEqual(5, day_8_handheld_halting.execute_compiled(program=program))
+
+    def test_repair(self) -> None:
+        instructions = day_8_handheld_halting.parse(lines=EXAMPLE_LINES)
+        program = day_8_handheld_halting.compile_instructions(instructions)
+
+        self.assertEqual(7, day_8_handheld_halting.find_repair(program=program))
+        self.assertEqual(8, day_8_handheld_halting.execute_repaired(program=program))
+
+    def test_repair_long_chain(self) -> None:
+        # The looping jump sits at the very end of a long chain of no-ops.
+        instructions = day_8_handheld_halting.parse(
+            lines=common.Lines(["acc +1"] * 10000 + ["jmp -10000", "acc +2"])
+        )
+        program = day_8_handheld_halting.compile_instructions(instructions)
+
+        self.assertEqual(10000, day_8_handheld_halting.find_repair(program=program))
+        self.assertEqual(
+            10002, day_8_handheld_halting.execute_repaired(program=program)
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
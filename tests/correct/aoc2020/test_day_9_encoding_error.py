@@ -1,5 +1,8 @@
 import unittest
+from typing import Any, Dict
 
+import hypothesis
+import hypothesis.strategies as st
 import icontract_hypothesis
 
 from python_by_contract_corpus.correct.aoc2020 import day_9_encoding_error
@@ -7,7 +10,12 @@ from python_by_contract_corpus.correct.aoc2020 import day_9_encoding_error
 
 class TestWithIcontractHypothesis(unittest.TestCase):
     def test_functions(self) -> None:
-        for func in [day_9_encoding_error.solve]:
+        for func in [
+            # NOTE: The length of the preamble is filtered too much by the inferred
+            # strategy, so ``solve`` is tested with an explicit strategy below.
+            # day_9_encoding_error.solve,
+            day_9_encoding_error.find_contiguous_range,
+        ]:
             try:
                 icontract_hypothesis.test_with_inferred_strategy(func)
             except Exception as error:
@@ -16,33 +24,94 @@ class TestWithIcontractHypothesis(unittest.TestCase):
                     f"(please see the original error above)"
                 ) from error
 
+    def test_solve(self) -> None:
+        strategy = st.lists(st.integers(min_value=0), min_size=1).flatmap(
+            lambda puzzle_input: st.fixed_dictionaries(
+                {
+                    "puzzle_input": st.just(puzzle_input),
+                    "preamble_length": st.integers(
+                        min_value=0, max_value=len(puzzle_input) - 1
+                    ),
+                }
+            )
+        )
+
+        @hypothesis.given(strategy)
+        def execute(kwargs: Dict[str, Any]) -> None:
+            day_9_encoding_error.solve(**kwargs)
+
+        execute()
+
+
+EXAMPLE_DATA = [
+    35,
+    20,
+    15,
+    25,
+    47,
+    40,
+    62,
+    55,
+    65,
+    95,
+    102,
+    117,
+    150,
+    182,
+    127,
+    219,
+    299,
+    277,
+    309,
+    576,
+]
+
 
 class TestManually(unittest.TestCase):
     def test_case(self) -> None:
-        example_data = [
-            35,
-            20,
-            15,
-            25,
-            47,
-            40,
+        self.assertEqual((14, 127), day_9_encoding_error.solve(EXAMPLE_DATA, 5))
+
+    def test_stream(self) -> None:
+        self.assertEqual(
+            (14, 127),
+            day_9_encoding_error.find_first_invalid(
+                numbers=(number for number in EXAMPLE_DATA), preamble_length=5
+            ),
+        )
+
+    def test_repeated_numbers_in_window(self) -> None:
+        self.assertEqual(
+            (2, 10),
+            day_9_encoding_error.find_first_invalid(
+                numbers=iter([5, 5, 10]), preamble_length=2
+            ),
+        )
+
+        self.assertIsNone(
+            day_9_encoding_error.find_first_invalid(
+                numbers=iter([5, 5, 10, 15, 20]), preamble_length=3
+            )
+        )
+
+    def test_contiguous_range(self) -> None:
+        self.assertEqual(
+            (2, 6),
+            day_9_encoding_error.find_contiguous_range(
+                puzzle_input=EXAMPLE_DATA, target=127
+            ),
+        )
+
+        self.assertEqual(
             62,
-            55,
-            65,
-            95,
-            102,
-            117,
-            150,
-            182,
-            127,
-            219,
-            299,
-            277,
-            309,
-            576,
-        ]
-
-        self.assertEqual((14, 127), day_9_encoding_error.solve(example_data, 5))
+            day_9_encoding_error.find_encryption_weakness(
+                puzzle_input=EXAMPLE_DATA, invalid_number=127
+            ),
+        )
+
+    def test_contiguous_range_needs_two_numbers(self) -> None:
+        self.assertIsNone(
+            day_9_encoding_error.find_contiguous_range(puzzle_input=[3, 1], target=3)
+        )
 
 
 if __name__ == "__main__":
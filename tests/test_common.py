@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+
+from python_by_contract_corpus import common
+
+
+class TestLines(unittest.TestCase):
+    def test_from_text(self) -> None:
+        self.assertListEqual(
+            ["a", "", "b", "c"], list(common.Lines.from_text("a\n\nb\r\nc"))
+        )
+        self.assertListEqual([], list(common.Lines.from_text("")))
+
+    def test_from_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "input.txt")
+            with open(path, "wt") as fid:
+                fid.write("a\nb\n")
+
+            self.assertListEqual(["a", "b"], list(common.Lines.from_file(path)))
+
+
+class TestMappedLines(unittest.TestCase):
+    def test_against_splitlines(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "input.txt")
+
+            for text in [
+                "",
+                "\n",
+                "a",
+                "a\n",
+                "a\nbc",
+                "a\n\nbc\n",
+                "a\r\nb\r\n\r\nc",
+                "ünïcödé\nlines",
+                "a\rb\n",
+                "a\r\r\nb\r",
+                "a\x0bb\x0cc\x1cd\x1de\x1ef",
+                "a\x85b\u2028c\u2029",
+                "\u0105\u2026\n",
+            ]:
+                with open(path, "wb") as fid:
+                    fid.write(text.encode("utf-8"))
+
+                with common.MappedLines(path) as lines:
+                    expected = text.splitlines()
+
+                    self.assertEqual(len(expected), len(lines), repr(text))
+                    self.assertListEqual(expected, list(lines), repr(text))
+                    self.assertListEqual(expected[1:], list(lines[1:]), repr(text))
+
+                    if expected:
+                        self.assertEqual(expected[-1], lines[-1], repr(text))
+
+                    block = lines.block(0, len(lines))
+                    self.assertEqual(text.encode("utf-8"), bytes(block), repr(text))
+                    block.release()
+
+    def test_index_error(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "input.txt")
+            with open(path, "wt") as fid:
+                fid.write("a\nb\n")
+
+            with common.MappedLines(path) as lines:
+                with self.assertRaises(IndexError):
+                    _ = lines[2]
+
+    def test_views(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "input.txt")
+            with open(path, "wb") as fid:
+                fid.write(b"ab\r\n\ncde")
+
+            lines = common.MappedLines(path)
+
+            view = lines.view(0)
+            self.assertEqual(b"ab", bytes(view))
+            view.release()
+
+            view = lines.view(2)
+            self.assertEqual(b"cde", bytes(view))
+            view.release()
+
+            block = lines.block(1, 3)
+            self.assertEqual(b"\ncde", bytes(block))
+            block.release()
+
+            block = lines.block(0, 2)
+            self.assertEqual(b"ab\r\n\n", bytes(block))
+            block.release()
+
+            lines.close()
+
+
+class TestSplitOnBlankLines(unittest.TestCase):
+    def test_empty(self) -> None:
+        self.assertListEqual([], list(common.split_on_blank_lines([])))
+        self.assertListEqual([], list(common.split_on_blank_lines(["", "  "])))
+
+
+class TestIterationHelpers(unittest.TestCase):
+    def test_pairwise_on_iterator(self) -> None:
+        self.assertListEqual(
+            [(0, 1), (1, 2), (2, 3)], list(common.pairwise(iter(range(4))))
+        )
+
+    def test_sliding_window_against_slices(self) -> None:
+        values = list(range(10))
+        for size in range(1, 12):
+            self.assertListEqual(
+                [tuple(values[i : i + size]) for i in range(len(values) - size + 1)],
+                list(common.sliding_window(iter(values), size)),
+            )
+
+    def test_chunked_against_slices(self) -> None:
+        values = list(range(10))
+        for size in range(1, 12):
+            self.assertListEqual(
+                [values[i : i + size] for i in range(0, len(values), size)],
+                list(common.chunked(iter(values), size)),
+            )
+
+    def test_differences(self) -> None:
+        self.assertListEqual([], list(common.differences([])))
+        self.assertListEqual(
+            [b - a for a, b in common.pairwise([3, 1, 4, 1, 5])],
+            list(common.differences(iter([3, 1, 4, 1, 5]))),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()